@@ -0,0 +1,155 @@
+"""Benchmark gen_tokens.py and fail when a metric regresses past its baseline.
+
+Measures, per slug: build time (builder + optimizer + serialization),
+output bytes (raw, optimized, gzip, brotli), element count and raster
+time; and overall: wall time of a full build at each --jobs value.
+"""
+import argparse, contextlib, gzip, io, json, pathlib, sys, tempfile, time
+
+import gen_tokens, scene, svgopt
+
+BASELINE = gen_tokens.DEV_DIR / "bench-baseline.json"
+RASTER_SIZE = 128
+
+# Metrics where noise is expected get the (looser) time threshold and an
+# absolute floor below which a change is never a regression.
+TIME_METRICS = ("build_ms", "raster_ms", "wall_ms")
+
+
+def best_of(fn, repeat):
+    """Return the fastest of `repeat` timed calls, in ms."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - start) * 1000)
+    return min(times)
+
+
+def build(slug):
+    root = svgopt.inline_fragments(gen_tokens.MONSTERS[slug]())
+    raw = scene.serialize(root).encode()
+    svgopt.optimize(root)
+    return root, raw, scene.serialize(root).encode()
+
+
+def bench_token(slug, repeat, raster):
+    root, raw, data = build(slug)
+    record = {
+        "build_ms": round(best_of(lambda: build(slug), repeat), 3),
+        "raw_bytes": len(raw),
+        "bytes": len(data),
+        "gzip_bytes": len(gzip.compress(data, 9)),
+        "elements": sum(1 for _ in root.iter()),
+    }
+    try:
+        import brotli
+        record["brotli_bytes"] = len(brotli.compress(data, quality=11))
+    except ImportError:
+        pass
+    if raster:
+        render = gen_tokens.rasterizer()
+        record["raster_ms"] = round(best_of(lambda: render(data, RASTER_SIZE), repeat), 3)
+    return record
+
+
+def bench_wall(jobs, repeat):
+    """Time a forced full build into a scratch directory per --jobs value."""
+    walls = {}
+    with tempfile.TemporaryDirectory() as out:
+        argv = ["--out", out, "--force", "--no-sprite"]
+        for n in jobs:
+            with contextlib.redirect_stdout(io.StringIO()):
+                walls[f"wall_ms_jobs_{n}"] = round(
+                    best_of(lambda: gen_tokens.main(argv + ["-j", str(n)]), repeat), 1)
+    return walls
+
+
+def run(slugs, repeat, jobs, raster):
+    tokens = {slug: bench_token(slug, repeat, raster) for slug in slugs}
+    totals = {key: round(sum(t[key] for t in tokens.values()), 3)
+              for key in next(iter(tokens.values()))}
+    totals.update(bench_wall(jobs, repeat))
+    return {"version": 1, "python": sys.version.split()[0], "tokens": tokens, "totals": totals}
+
+
+def flatten(results):
+    flat = {f"totals.{k}": v for k, v in results["totals"].items()}
+    for slug, record in results["tokens"].items():
+        flat.update((f"{slug}.{k}", v) for k, v in record.items())
+    return flat
+
+
+def compare(results, baseline, threshold, time_threshold, min_ms):
+    """Return (metric, old, new, change %) for every metric that got worse."""
+    old, new = flatten(baseline), flatten(results)
+    regressions = []
+    for key, value in new.items():
+        before = old.get(key)
+        if not before:
+            continue
+        timing = any(m in key for m in TIME_METRICS)
+        limit = time_threshold if timing else threshold
+        change = (value - before) / before * 100
+        if change > limit and not (timing and value - before < min_ms):
+            regressions.append((key, before, value, change))
+    return regressions
+
+
+def report(results):
+    cols = ["build_ms", "raw_bytes", "bytes", "gzip_bytes", "brotli_bytes", "elements", "raster_ms"]
+    cols = [c for c in cols if c in results["totals"]]
+    print(f"{'slug':<20}" + "".join(f"{c:>14}" for c in cols))
+    for slug, record in results["tokens"].items():
+        print(f"{slug:<20}" + "".join(f"{record[c]:>14}" for c in cols))
+    print(f"{'TOTAL':<20}" + "".join(f"{results['totals'][c]:>14}" for c in cols))
+    for key, value in results["totals"].items():
+        if key.startswith("wall_ms"):
+            print(f"  {key}: {value} ms")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--only", metavar="SLUGS", help="comma-separated slugs (default: all)")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per metric; the best counts")
+    parser.add_argument("--jobs", default="1,2,4", help="--jobs values to time full builds at")
+    parser.add_argument("--no-raster", dest="raster", action="store_false",
+                        help="skip raster timings (implied when no rasterizer is installed)")
+    parser.add_argument("--baseline", type=pathlib.Path, default=BASELINE,
+                        help="results to compare against and --save to (default: %(default)s)")
+    parser.add_argument("--save", action="store_true", help="write the results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=5.0,
+                        help="allowed %% growth of size and count metrics (default: %(default)s)")
+    parser.add_argument("--time-threshold", type=float, default=25.0,
+                        help="allowed %% growth of timings (default: %(default)s)")
+    parser.add_argument("--min-ms", type=float, default=0.5,
+                        help="ignore timing regressions smaller than this (default: %(default)s)")
+    args = parser.parse_args(argv)
+    slugs = args.only.split(",") if args.only else list(gen_tokens.MONSTERS)
+    jobs = [int(n) for n in args.jobs.split(",")]
+    if args.raster:
+        try:
+            gen_tokens.rasterizer()
+        except RuntimeError as e:
+            print(f"skipping raster timings: {e}", file=sys.stderr)
+            args.raster = False
+
+    results = run(slugs, args.repeat, jobs, args.raster)
+    report(results)
+    status = 0
+    if args.baseline.exists():
+        baseline = json.loads(args.baseline.read_text())
+        regressions = compare(results, baseline, args.threshold, args.time_threshold, args.min_ms)
+        for key, before, after, change in regressions:
+            print(f"  REGRESSION {key}: {before} -> {after} ({change:+.1f}%)", file=sys.stderr)
+        print(f"\n{len(regressions)} regression(s) against {args.baseline.name}")
+        status = 1 if regressions else 0
+    if args.save:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(results, indent=2) + "\n")
+        print(f"saved baseline to {args.baseline}")
+    return status
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,518 @@
+"""Compose parametric tokens for every SRD monster from archetype parts.
+
+Each monster is planned from its stat block: its creature type picks an
+archetype (head shape, ears, eyes, teeth, skin), name keywords refine it
+(beaks, tusks, colour words), and the species, role and mood traits in
+tools/art-generator/data/styles/*.json are matched by keyword onto parts
+("tusks", "narrowed eyes", "quiver visible", ...). Plans are built into
+optimized SVGs in a process pool.
+
+The pipeline is a chain of generators (read -> plan -> build -> write)
+with a bounded number of batches in flight, so memory stays flat however
+long the bestiary is. Tokens go to <out>/srd/<slug>.svg; srd-tokens.json
+maps each monster id to its token, preferring hand-drawn art.
+
+    python3 bestiary.py                      # SRD monsters without hand-drawn art
+    python3 bestiary.py --all -j 0           # every SRD monster, one worker per CPU
+    python3 bestiary.py --source more.jsonl  # one stat block (srd.ts keys) per line
+"""
+import argparse, collections, colorsys, concurrent.futures, functools, hashlib, itertools
+import json, os, pathlib, re, sys, time
+
+import gen_tokens, output, scene, svgopt
+from gen_tokens import empty_eye_sockets, eyes, glow_eyes, tok
+from scene import circle, ellipse, line, path, polygon, rect
+
+ROOT = pathlib.Path(__file__).resolve().parents[3]
+SRD = ROOT / "app" / "lib" / "data" / "srd.ts"
+STYLES = ROOT / "tools" / "art-generator" / "data" / "styles"
+OUT = gen_tokens.OUT
+SUBDIR = "srd"
+INDEX_FILE = "srd-tokens.json"
+BATCH = 16   # plans per pool task
+WINDOW = 4   # batches in flight per worker
+
+# Starting parts per creature type (the first word of the SRD type).
+ARCHETYPES = {
+    "humanoid": dict(head="round", ears="round", skin="#c8946a", eyes="normal", mouth="neutral"),
+    "beast": dict(head="snout", ears="beast", skin="#8a6a4a", eyes="normal", teeth="fangs"),
+    "undead": dict(head="skull", skin="#b8b4a0", eyes="glow", iris="#7fffd4", mouth="grim"),
+    "dragon": dict(head="wedge", horns="curved", skin="#4a7a3a", eyes="glow", iris="#ffd400",
+                   teeth="fangs"),
+    "ooze": dict(head="blob", skin="#8a9a7a", eyes="wide"),
+    "giant": dict(head="round", ears="pointed", skin="#b08060", brow="heavy", teeth="tusks",
+                  mouth="grim"),
+    "monstrosity": dict(head="snout", skin="#6a7a4a", eyes="wide", teeth="jagged"),
+    "elemental": dict(head="wisp", skin="#a0a0a0", eyes="glow", iris="#ffffff"),
+    "construct": dict(head="block", skin="#8a7a6a", eyes="glow", iris="#ffb000"),
+    "aberration": dict(head="blob", skin="#7a4a8a", eyes="wide", teeth="jagged"),
+    "fiend": dict(head="round", horns="curved", skin="#a03020", eyes="glow", iris="#ffd400",
+                  teeth="fangs"),
+    "celestial": dict(head="round", skin="#e8d8a8", eyes="glow", iris="#fff8c0", halo=True),
+    "fey": dict(head="round", ears="long", skin="#a8c8a0", eyes="wide"),
+    "plant": dict(head="blob", skin="#4a7a2a", eyes="glow", iris="#d4ff60"),
+}
+DEFAULT_ARCHETYPE = "monstrosity"
+
+# Name keywords, matched as whole words, in order; later matches win.
+NAME_PARTS = [
+    ("rat", dict(ears="round", skin="#7a6a5a")), ("boar", dict(teeth="tusks", ears="beast")),
+    ("bear", dict(ears="round", skin="#6a4424")), ("ape", dict(head="round", ears="round")),
+    ("panther", dict(skin="#2a2a30", iris="#d4c000")), ("owl", dict(head="beak", ears="tufts")),
+    ("eagle", dict(head="beak", ears=None, skin="#6a4a2a")),
+    ("snake", dict(head="wedge", ears=None, teeth="fangs", skin="#5a7a3a")),
+    ("spider", dict(head="round", ears=None, eyes="many", teeth="fangs", skin="#3a3030")),
+    ("red", dict(skin="#b03020")), ("green", dict(skin="#4a7a3a")),
+    ("blue", dict(skin="#3060b0")), ("white", dict(skin="#d8e0e8")),
+    ("black", dict(skin="#303038")), ("gray", dict(skin="#8a8a8a")), ("ochre", dict(skin="#c89030")),
+    ("fire", dict(skin="#e06010", iris="#fff0a0")), ("water", dict(skin="#3080c0")),
+    ("air", dict(skin="#b8d0e0")), ("earth", dict(skin="#7a5a3a", head="block")),
+    ("clay", dict(skin="#a07050")),
+]
+
+# Trait phrases from the style files, mapped onto parts.
+TRAIT_PARTS = [
+    ("sharp ears", dict(ears="long")), ("pointed ears", dict(ears="pointed")),
+    ("tusks", dict(teeth="tusks")), ("heavy brow", dict(brow="heavy")),
+    ("hollow eye sockets", dict(eyes="sockets")), ("exposed bone", dict(head="skull", skin="#d8d0b8")),
+    ("sunken eyes", dict(eyes="sunken")), ("snout", dict(head="snout")),
+    ("scaled", dict(skin="#a0522d")), ("green skin", dict(skin="#7a9c42")),
+    ("torn flesh", dict(skin="#7d8c6a", scar=True)), ("shaggy fur", dict(skin="#7a4a22")),
+    ("thick fur", dict(skin="#6e6e74", head="snout", ears="beast")),
+    ("weathered", dict(skin="#c08a5a")),
+    ("cloak", dict(gear="hood")), ("weapon held", dict(gear="helmet")),
+    ("quiver", dict(gear="quiver")), ("trinkets", dict(gear="charms")),
+    ("leather straps", dict(gear="straps", scar=True)), ("arcane", dict(gear="rune")),
+    ("magical haze", dict(haze=True)),
+    ("tense jaw", dict(mouth="grim", brow="angry")), ("narrowed eyes", dict(eyes="narrow")),
+    ("smirk", dict(mouth="smirk")), ("wide eyes", dict(eyes="wide")),
+    ("bared teeth", dict(mouth="snarl")), ("calm gaze", dict(mouth="neutral")),
+    ("hollow presence", dict(pale=True)),
+]
+SIZES = {"tiny": 0.82, "small": 0.9, "medium": 1.0, "large": 1.06, "huge": 1.1, "gargantuan": 1.12}
+
+Plan = collections.namedtuple("Plan", "slug id parts")
+
+
+# ── Reading ──────────────────────────────────────────────────────────────────
+
+_FIELD = re.compile(r'^\s{4}(\w+): (.*?),?$')
+_STRING = re.compile(r'"((?:[^"\\]|\\.)*)"')
+_NUMBER = re.compile(r"(\w+): (\d+)")
+
+
+def read_srd(path):
+    """Yield the monster stat blocks of srd.ts one at a time, as dicts.
+
+    Only the fields planning needs are read: string fields, abilities and
+    the traits/actions string lists.
+    """
+    inside = False
+    record, key = None, None
+    with open(path, encoding="utf-8") as f:
+        for text in f:
+            stripped = text.rstrip()
+            if stripped.startswith("const seedMonstersBase"):
+                inside = True
+            elif not inside:
+                continue
+            elif stripped == "];":
+                return
+            elif stripped == "  {":
+                record = {}
+            elif stripped in ("  },", "  }"):
+                yield record
+                record = None
+            elif record is not None:
+                m = _FIELD.match(stripped)
+                if m:
+                    key, value = m.groups()
+                    if value.startswith('"'):
+                        record[key] = _STRING.match(value).group(1)
+                    elif key == "abilities":
+                        record[key] = {k: int(v) for k, v in _NUMBER.findall(value)}
+                    elif value.startswith("["):
+                        record[key] = _STRING.findall(value)
+                elif key in ("traits", "actions"):
+                    record[key] = record.get(key, []) + _STRING.findall(stripped)
+
+
+def read_jsonl(path):
+    with open(path, encoding="utf-8") as f:
+        for text in f:
+            if text.strip():
+                yield json.loads(text)
+
+
+def load_styles(styles=STYLES):
+    return {kind: json.loads((styles / f"{kind}-traits.json").read_text())
+            for kind in ("species", "role", "mood")}
+
+
+# ── Planning ─────────────────────────────────────────────────────────────────
+
+def words(text):
+    return set(re.findall(r"[a-z]+", text.lower()))
+
+
+def pick_species(record, species):
+    """The longest species key contained in the monster's name or type."""
+    name = f"{record.get('name', '')} {record.get('type', '')}".lower()
+    return next((k for k in sorted(species, key=len, reverse=True) if k in name), None)
+
+
+def pick_role(record, kind):
+    if kind not in ("humanoid", "giant"):
+        return None
+    name = record.get("name", "").lower()
+    text = " ".join(record.get("actions", []) + record.get("traits", [])).lower()
+    if "scout" in name:
+        return "scout"
+    if "spellcasting" in text or "spell" in text:
+        return "shaman" if any(w in name for w in ("priest", "acolyte", "cultist")) else "spellcaster"
+    if "bow" in text:
+        return "archer"
+    if record.get("abilities", {}).get("str", 10) >= 16:
+        return "brute"
+    return "warrior"
+
+
+def pick_mood(record, kind):
+    alignment = record.get("alignment", "").lower()
+    if kind == "undead":
+        return "haunted"
+    if kind in ("beast", "monstrosity", "ooze"):
+        return "feral"
+    if "chaotic evil" in alignment:
+        return "menacing"
+    if "evil" in alignment or record.get("abilities", {}).get("int", 10) >= 13:
+        return "cunning"
+    return "stoic"
+
+
+def apply_traits(parts, text):
+    text = text.lower()
+    for phrase, changes in TRAIT_PARTS:
+        if phrase in text:
+            parts.update(changes)
+
+
+def plan(record, styles):
+    """Decide a monster's parts; cheap, so it runs in the reading process."""
+    slug = record["id"].removeprefix("mon-")
+    kind = record.get("type", "").split(" ")[0].lower()
+    if kind not in ARCHETYPES:
+        kind = DEFAULT_ARCHETYPE
+    parts = dict(ARCHETYPES[kind], kind=kind, size=SIZES.get(record.get("size", "").lower(), 1.0))
+    # Mood first: anatomy from species and name overrides an expression.
+    mood = pick_mood(record, kind)
+    role = pick_role(record, kind)
+    species = pick_species(record, styles["species"])
+    apply_traits(parts, styles["mood"].get(mood, ""))
+    apply_traits(parts, styles["role"].get(role, ""))
+    if species:
+        apply_traits(parts, styles["species"][species])
+    name = words(record.get("name", ""))
+    for word, changes in NAME_PARTS:
+        if word in name:
+            parts.update(changes)
+    parts.update(mood=mood, role=role, species=species,
+                 seed=hashlib.sha1(slug.encode()).digest()[:4])
+    return Plan(slug, record["id"], parts)
+
+
+# ── Composing ────────────────────────────────────────────────────────────────
+
+def shade(color, factor):
+    """Scale a hex colour's lightness; factor < 1 darkens."""
+    r, g, b = (int(color[i:i + 2], 16) / 255 for i in (1, 3, 5))
+    h, l, s = colorsys.rgb_to_hls(r, g, b)
+    r, g, b = colorsys.hls_to_rgb(h, min(1.0, l * factor), s)
+    return "#%02x%02x%02x" % (round(r * 255), round(g * 255), round(b * 255))
+
+
+def desaturate(color, amount=0.6):
+    r, g, b = (int(color[i:i + 2], 16) / 255 for i in (1, 3, 5))
+    h, l, s = colorsys.rgb_to_hls(r, g, b)
+    r, g, b = colorsys.hls_to_rgb(h, l, s * (1 - amount))
+    return "#%02x%02x%02x" % (round(r * 255), round(g * 255), round(b * 255))
+
+
+def head(p, skin, w, h):
+    kind, dark, light = p["head"], shade(skin, 0.7), shade(skin, 1.25)
+    if kind == "snout":
+        return [ellipse(100, 100, w, h, fill=skin), ellipse(100, 130, w * 0.5, h * 0.38, fill=light),
+                ellipse(100, 120, 8, 6, fill="#1a1a1a")]
+    if kind == "skull":
+        return [ellipse(100, 98, w * 0.92, h * 0.86, fill=skin),
+                rect(100 - w * 0.5, 128, w, 22, fill=skin, rx=8),
+                polygon("100,112 94,124 106,124", fill="#1a1a1a"),
+                *(line(100 + x, 132, 100 + x, 148, stroke=dark, stroke_width=2)
+                  for x in (-15, -5, 5, 15))]
+    if kind == "wedge":
+        return [polygon(f"{100 - w},88 100,{96 - h} {100 + w},88 {100 + w * 0.6},130 100,{108 + h} "
+                        f"{100 - w * 0.6},130", fill=skin),
+                circle(92, 140, 2.5, fill=dark), circle(108, 140, 2.5, fill=dark)]
+    if kind == "blob":
+        return [path(f"M{100 - w} 120 Q{100 - w} {100 - h} 100 {100 - h} Q{100 + w} {100 - h} "
+                     f"{100 + w} 120 Q{100 + w * 0.8} {110 + h * 0.6} 100 {108 + h * 0.6} "
+                     f"Q{100 - w * 0.8} {110 + h * 0.6} {100 - w} 120Z", fill=skin, opacity=0.85),
+                ellipse(100 - w * 0.4, 100 - h * 0.5, w * 0.25, h * 0.15, fill="#fff", opacity=0.3)]
+    if kind == "block":
+        return [rect(100 - w, 100 - h, w * 2, h * 2, rx=10, fill=skin),
+                path(f"M{100 - w * 0.6} {100 - h * 0.4} L{100 - w * 0.2} {100 - h * 0.1}",
+                     stroke=dark, stroke_width=3, fill="none")]
+    if kind == "wisp":
+        return [path(f"M100 {100 - h * 1.3} Q{100 + w * 1.2} {100 - h * 0.2} {100 + w} {100 + h * 0.6} "
+                     f"Q100 {100 + h * 1.3} {100 - w} {100 + h * 0.6} Q{100 - w * 1.2} {100 - h * 0.2} "
+                     f"100 {100 - h * 1.3}Z", fill=skin, opacity=0.8),
+                ellipse(100, 110, w * 0.6, h * 0.6, fill=light, opacity=0.5)]
+    shapes = [ellipse(100, 105, w, h, fill=skin)]
+    if kind == "beak":
+        shapes.append(polygon("92,114 108,114 100,134", fill="#d4a020"))
+    return shapes
+
+
+def ears(p, skin, w):
+    kind, inner = p.get("ears"), shade(skin, 0.75)
+    lx, rx = 100 - w, 100 + w
+    if kind == "long":
+        return [polygon(f"{lx + 6},92 {lx - 30},78 {lx + 4},110", fill=skin),
+                polygon(f"{rx - 6},92 {rx + 30},78 {rx - 4},110", fill=skin)]
+    if kind == "pointed":
+        return [polygon(f"{lx + 4},90 {lx - 12},76 {lx + 2},112", fill=skin),
+                polygon(f"{rx - 4},90 {rx + 12},76 {rx - 2},112", fill=skin)]
+    if kind == "round":
+        return [circle(lx + 2, 96, 11, fill=skin), circle(lx + 2, 96, 6, fill=inner),
+                circle(rx - 2, 96, 11, fill=skin), circle(rx - 2, 96, 6, fill=inner)]
+    if kind == "beast":
+        return [polygon(f"{lx + 8},74 {lx + 2},46 {lx + 28},62", fill=skin),
+                polygon(f"{rx - 8},74 {rx - 2},46 {rx - 28},62", fill=skin)]
+    if kind == "tufts":
+        return [polygon(f"{lx + 14},66 {lx + 6},44 {lx + 30},58", fill=shade(skin, 0.8)),
+                polygon(f"{rx - 14},66 {rx - 6},44 {rx - 30},58", fill=shade(skin, 0.8))]
+    return []
+
+
+def horns(p, h):
+    if p.get("horns") != "curved":
+        return []
+    top = 100 - h
+    return [path(f"M78 {top + 14} Q60 {top - 6} 66 {top - 24}", stroke="#e8dcc0", stroke_width=7,
+                 fill="none", stroke_linecap="round"),
+            path(f"M122 {top + 14} Q140 {top - 6} 134 {top - 24}", stroke="#e8dcc0", stroke_width=7,
+                 fill="none", stroke_linecap="round")]
+
+
+def face(p, skin):
+    kind, iris = p.get("eyes"), p.get("iris", "#d4a000")
+    lx, rx, y = 84, 116, 98
+    if kind == "sockets":
+        return empty_eye_sockets(lx, rx, y)
+    if kind == "glow":
+        return glow_eyes(lx, rx, y, color=iris)
+    if kind == "sunken":
+        return [empty_eye_sockets(lx, rx, y), circle(lx, y, 2.5, fill=iris), circle(rx, y, 2.5, fill=iris)]
+    if kind == "many":
+        return [circle(x, yy, r, fill="#c00000") for x, yy, r in (
+            (88, 96, 5), (112, 96, 5), (78, 88, 3), (122, 88, 3), (94, 86, 3), (106, 86, 3))]
+    if kind == "wide":
+        return eyes(lx, rx, y, r=9, iris=iris)
+    shapes = [eyes(lx, rx, y, r=7, iris=iris)]
+    if kind == "narrow":
+        shapes += [rect(lx - 9, y - 9, 18, 7, fill=skin), rect(rx - 9, y - 9, 18, 7, fill=skin)]
+    return shapes
+
+
+def brow(p, skin):
+    dark = shade(skin, 0.6)
+    if p.get("brow") == "heavy":
+        return [ellipse(100, 84, 34, 7, fill=dark)]
+    if p.get("brow") == "angry":
+        return [line(72, 82, 94, 90, stroke=dark, stroke_width=4, stroke_linecap="round"),
+                line(128, 82, 106, 90, stroke=dark, stroke_width=4, stroke_linecap="round")]
+    return []
+
+
+def mouth(p, skin):
+    kind, teeth, dark = p.get("mouth", "neutral"), p.get("teeth"), shade(skin, 0.4)
+    shapes = []
+    if kind == "snarl":
+        shapes.append(ellipse(100, 140, 16, 8, fill="#2a0a0a"))
+    elif kind == "grim":
+        shapes.append(line(86, 140, 114, 140, stroke=dark, stroke_width=3, stroke_linecap="round"))
+    elif kind == "smirk":
+        shapes.append(path("M86 140 Q100 144 116 134", stroke=dark, stroke_width=3, fill="none",
+                           stroke_linecap="round"))
+    elif p["head"] not in ("skull", "blob", "wisp"):
+        shapes.append(path("M88 140 Q100 146 112 140", stroke=dark, stroke_width=3, fill="none",
+                           stroke_linecap="round"))
+    if teeth == "tusks":
+        shapes += [polygon("88,142 84,128 93,138", fill="#f0e8c0"),
+                   polygon("112,142 116,128 107,138", fill="#f0e8c0")]
+    elif teeth == "fangs":
+        shapes += [polygon("92,138 95,150 98,138", fill="#f8f8f0"),
+                   polygon("102,138 105,150 108,138", fill="#f8f8f0")]
+    elif teeth == "jagged":
+        shapes.append(polygon("84,138 88,148 92,138 96,148 100,138 104,148 108,138 112,148 116,138",
+                              fill="#f0e8d8"))
+    return shapes
+
+
+def gear(p, w, h):
+    kind = p.get("gear")
+    top = 105 - h
+    if kind == "hood":
+        return [path(f"M{100 - w - 8} 130 Q{100 - w - 8} {top - 12} 100 {top - 12} "
+                     f"Q{100 + w + 8} {top - 12} {100 + w + 8} 130 L{100 + w} 128 "
+                     f"Q{100 + w} {top} 100 {top} Q{100 - w} {top} {100 - w} 128Z", fill="#4a5a3a")]
+    if kind == "helmet":
+        return [path(f"M{100 - w} {top + 20} Q100 {top - 16} {100 + w} {top + 20}Z", fill="#8a9098"),
+                rect(96, top + 14, 8, 24, fill="#8a9098")]
+    if kind == "quiver":
+        return [rect(150, 40, 12, 44, fill="#6a4424", transform="rotate(20 156 62)"),
+                *(line(150 + i * 5, 40, 146 + i * 5, 26, stroke="#e8e0d0", stroke_width=2)
+                  for i in range(3))]
+    if kind == "charms":
+        return [circle(x, 170, 4, fill=c) for x, c in ((84, "#c8a040"), (100, "#80e0ff"), (116, "#c8a040"))]
+    if kind == "straps":
+        return [line(60, 150, 140, 186, stroke="#5a3a1a", stroke_width=6)]
+    if kind == "rune":
+        return [polygon(f"100,{top + 10} 106,{top + 18} 100,{top + 26} 94,{top + 18}",
+                        fill="#a0e0ff", opacity=0.9)]
+    return []
+
+
+def compose(plan):
+    """Build one plan into a token tree with the shared gen_tokens helpers."""
+    p = plan.parts
+    jitter = [b / 255 - 0.5 for b in p["seed"]]
+    skin = p["skin"]
+    if p.get("pale"):
+        skin = shade(desaturate(skin), 1.15)
+    w = (44 + 6 * jitter[0]) * p["size"]
+    h = (46 + 6 * jitter[1]) * p["size"]
+    body = [
+        circle(100, 100, 70, fill=p.get("iris", "#ffffff"), opacity=0.12) if p.get("haze") else None,
+        circle(100, 100 - h - 6, 20, fill="none", stroke="#ffe880", stroke_width=4) if p.get("halo") else None,
+        horns(p, h), ears(p, skin, w), head(p, skin, w, h),
+        brow(p, skin), face(p, skin), mouth(p, skin), gear(p, w, h),
+        line(76, 84, 92, 116, stroke=shade(skin, 0.55), stroke_width=3) if p.get("scar") else None,
+    ]
+    return tok(shade(skin, 0.3), shade(skin, 0.45), *body)
+
+
+# ── Pipeline ─────────────────────────────────────────────────────────────────
+
+def build_batch(plans, optimize=True):
+    out = []
+    for item in plans:
+        root = svgopt.inline_fragments(compose(item))
+        if optimize:
+            svgopt.optimize(root)
+        out.append((item, scene.serialize(root).encode()))
+    return out
+
+
+def batched(items, size):
+    items = iter(items)
+    while batch := list(itertools.islice(items, size)):
+        yield batch
+
+
+def bounded_map(fn, batches, workers):
+    """Like Executor.map, but with at most workers * WINDOW batches queued."""
+    if workers <= 1:
+        yield from map(fn, batches)
+        return
+    with concurrent.futures.ProcessPoolExecutor(workers) as pool:
+        pending = collections.deque()
+        for batch in batches:
+            pending.append(pool.submit(fn, batch))
+            if len(pending) >= workers * WINDOW:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def run(records, styles, writer, workers=1, drawn=(), redraw=False, optimize=True, dry_run=False):
+    """Plan, build and write every record; return counts and the id index.
+
+    Monsters whose slug is in drawn are indexed to their hand-drawn token
+    and, unless redraw, not built at all; a generated token left over
+    from before the art was drawn is deleted. With dry_run nothing is
+    written and written counts the tokens that would be.
+    """
+    out = writer.root
+    index = {}
+    stale = []
+
+    def plans():
+        for record in records:
+            if not record.get("id"):
+                continue
+            slug = record["id"].removeprefix("mon-")
+            if slug in drawn:
+                index[record["id"]] = gen_tokens.public_url(out, f"{slug}.svg")
+                if not redraw:
+                    if writer.exists(f"{SUBDIR}/{slug}.svg"):
+                        stale.append(f"{SUBDIR}/{slug}.svg")
+                    continue
+            yield plan(record, styles)
+
+    counts = collections.Counter(written=0, unchanged=0, deleted=0)
+    build = functools.partial(build_batch, optimize=optimize)
+    for results in bounded_map(build, batched(plans(), BATCH), workers):
+        for item, data in results:
+            name = f"{SUBDIR}/{item.slug}.svg"
+            index.setdefault(item.id, gen_tokens.public_url(out, name))
+            if writer.read(name) != data if dry_run else writer.write(name, data):
+                counts["written"] += 1
+            else:
+                counts["unchanged"] += 1
+    for name in stale:
+        if not dry_run:
+            writer.delete(name)
+        print(f"  {'would delete' if dry_run else 'deleted'} {name}")
+        counts["deleted"] += 1
+    return counts, index
+
+
+def hand_drawn(out):
+    """Slugs that already have art: token definitions or files on disk."""
+    return set(gen_tokens.MONSTERS) | {p.stem for p in out.glob("*.svg") if "." not in p.stem}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--source", type=pathlib.Path, default=SRD,
+                        help="srd.ts, or a .jsonl file of stat blocks (default: %(default)s)")
+    parser.add_argument("--out", type=pathlib.Path, default=OUT)
+    parser.add_argument("--all", action="store_true",
+                        help="also build monsters that have hand-drawn art")
+    parser.add_argument("-j", "--jobs", type=int, default=1, metavar="N",
+                        help="build in N worker processes (0: one per CPU)")
+    parser.add_argument("--no-optimize", dest="optimize", action="store_false")
+    parser.add_argument("--dry-run", action="store_true", help="build without writing")
+    args = parser.parse_args(argv)
+    workers = args.jobs or os.cpu_count() or 1
+    records = read_jsonl(args.source) if args.source.suffix == ".jsonl" else read_srd(args.source)
+    start = time.perf_counter()
+    with output.DirectoryWriter(args.out) as writer:
+        counts, index = run(records, load_styles(), writer, workers, hand_drawn(args.out),
+                            redraw=args.all, optimize=args.optimize, dry_run=args.dry_run)
+        if not args.dry_run:
+            writer.write(INDEX_FILE, (json.dumps(dict(sorted(index.items())), indent=2) + "\n").encode())
+    ms = (time.perf_counter() - start) * 1000
+    if args.dry_run:
+        print(f"Dry run: would write {counts['written']}, keep {counts['unchanged']}, "
+              f"delete {counts['deleted']}, index {len(index)} in {ms:.0f} ms")
+    else:
+        print(f"Done: {counts['written']} written, {counts['unchanged']} unchanged, "
+              f"{counts['deleted']} deleted, {len(index)} indexed in {ms:.0f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,331 @@
+"""Canvas draw commands: token trees flattened for a Canvas 2D / Path2D renderer.
+
+commands(root) walks a token tree (optimized or not) and returns one
+command per painted shape, in paint order, with inherited attributes,
+<use> instances and currentColor resolved, so a renderer never meets a
+group or a reference:
+
+    [style, "circle", cx, cy, r]
+    [style, "ellipse", cx, cy, rx, ry]
+    [style, "rect", x, y, width, height]         + rx, ry when rounded
+    [style, "line", x1, y1, x2, y2]
+    [style, "polygon", [x0, y0, x1, y1, ...]]    "polyline" when open
+    [style, "path", d]                           SVG path data, for new Path2D(d)
+    [style, "text", x, y, text, font, align]
+
+style holds only what differs from drawing nothing: fill and stroke (a
+CSS colour or a gradient), lineWidth, lineCap, lineJoin, alpha (for
+globalAlpha), fillAlpha and strokeAlpha, and transform, an [a, b, c, d,
+e, f] matrix for ctx.transform(). Translations are folded into the
+coordinates, so only rotated, scaled or skewed shapes carry a transform.
+
+A gradient is {"type": "radial" | "linear", "coords": [...], "stops":
+[[offset, colour], ...]}, coords in the argument order of
+createRadialGradient / createLinearGradient. With "matrix" the coords are
+in the shape's bounding-box space (SVG's objectBoundingBox) and matrix
+maps that space onto the shape's own coordinates.
+
+Group and <use> opacity is multiplied into each shape's alpha, which is
+exact as long as the shapes of a translucent group do not overlap; the
+optimizer's opacity flattening leaves few such groups.
+
+bundle() merges the commands of many tokens into one document with a
+shared style table, so a renderer can preload every token at once.
+"""
+import math, re
+
+import svgopt
+
+VERSION = 1
+IDENTITY = (1.0, 0.0, 0.0, 1.0, 0.0, 0.0)
+UNSUPPORTED = {"clip-path", "mask", "filter"}
+ALIGN = {"start": "start", "middle": "center", "end": "end"}
+_TRANSFORM = re.compile(r"(matrix|translate|scale|rotate|skewX|skewY)\s*\(([^)]*)\)")
+_URL = re.compile(r"url\(#([^)]+)\)")
+
+
+def _num(value, digits=3):
+    """A JSON number: rounded to digits decimals, and an int when whole."""
+    value = round(float(value), digits)
+    return int(value) if value.is_integer() else value
+
+
+def _multiply(m, n):
+    a, b, c, d, e, f = m
+    return (a * n[0] + c * n[1], b * n[0] + d * n[1],
+            a * n[2] + c * n[3], b * n[2] + d * n[3],
+            a * n[4] + c * n[5] + e, b * n[4] + d * n[5] + f)
+
+
+def parse_transform(value):
+    """The matrix of an SVG transform list."""
+    matrix = IDENTITY
+    for name, args in _TRANSFORM.findall(value or ""):
+        v = [float(n) for n in svgopt._NUMBER.findall(args)]
+        if name == "matrix":
+            step = tuple(v)
+        elif name == "translate":
+            step = (1, 0, 0, 1, v[0], v[1] if len(v) > 1 else 0)
+        elif name == "scale":
+            step = (v[0], 0, 0, v[1] if len(v) > 1 else v[0], 0, 0)
+        elif name == "rotate":
+            cos, sin = math.cos(math.radians(v[0])), math.sin(math.radians(v[0]))
+            cx, cy = (v[1], v[2]) if len(v) > 2 else (0, 0)
+            step = (cos, sin, -sin, cos, cx - cos * cx + sin * cy, cy - sin * cx - cos * cy)
+        elif name == "skewX":
+            step = (1, 0, math.tan(math.radians(v[0])), 1, 0, 0)
+        else:
+            step = (1, math.tan(math.radians(v[0])), 0, 1, 0, 0)
+        matrix = _multiply(matrix, step)
+    return matrix
+
+
+def _matrix(m):
+    # Rotations need more digits than coordinates: the error grows with
+    # the distance from the origin.
+    return [_num(v, 3 if i > 3 else 6) for i, v in enumerate(m)]
+
+
+# Absolute path commands and which of their arguments are x (0) or y (1);
+# arcs move only their end point.
+_AXES = {"M": (0, 1), "L": (0, 1), "T": (0, 1), "H": (0,), "V": (1,),
+         "C": (0, 1) * 3, "S": (0, 1) * 2, "Q": (0, 1) * 2,
+         "A": (None, None, None, None, None, 0, 1)}
+
+
+def translate_path(d, dx, dy):
+    """Path data moved by dx, dy; relative commands stay as they are."""
+    out = []
+    command, index, first = "", 0, True
+    for tok in svgopt._PATH_TOKEN.findall(d):
+        if tok.isalpha():
+            command, index = tok, 0
+            out.append(tok)
+            continue
+        axes = _AXES.get(command)
+        if axes is None and command == "m" and first and index < 2:
+            axes = (0, 1)  # a leading m is absolute
+        value = float(tok)
+        if axes is not None:
+            axis = axes[index % len(axes)]
+            value += dx if axis == 0 else dy if axis == 1 else 0
+        index += 1
+        if command in "Mm" and index % 2 == 0:
+            first = False
+        out.append(str(value))
+    return svgopt.fmt_path(" ".join(out), 3)
+
+
+def _color(value, opacity=1.0):
+    """A CSS colour string, with alpha folded in as #rrggbbaa when below 1."""
+    value = svgopt.fmt_color(value.strip().lower())
+    if opacity >= 1 or not value.startswith("#"):
+        return value
+    hex6 = value[1:] if len(value) == 7 else "".join(ch * 2 for ch in value[1:4])
+    return f"#{hex6}{round(opacity * 255):02x}"
+
+
+def _bbox(shape):
+    kind, args = shape[0], shape[1:]
+    if kind == "circle":
+        cx, cy, r = args
+        return cx - r, cy - r, cx + r, cy + r
+    if kind == "ellipse":
+        cx, cy, rx, ry = args
+        return cx - rx, cy - ry, cx + rx, cy + ry
+    if kind == "rect":
+        x, y, w, h = args[:4]
+        return x, y, x + w, y + h
+    if kind == "line":
+        x1, y1, x2, y2 = args
+        return min(x1, x2), min(y1, y2), max(x1, x2), max(y1, y2)
+    if kind in ("polygon", "polyline"):
+        points = [tuple(args[0][i:i + 2]) for i in range(0, len(args[0]), 2)]
+    elif kind == "path":
+        points = [p for sub in svgopt.path_points(args[0]) or [] for p in sub]
+    else:
+        points = []
+    if not points:
+        return None
+    xs, ys = [p[0] for p in points], [p[1] for p in points]
+    return min(xs), min(ys), max(xs), max(ys)
+
+
+def _fraction(value, default):
+    value = str(value if value is not None else default).strip()
+    return float(value[:-1]) / 100 if value.endswith("%") else float(value)
+
+
+def _gradient(el, fragments, shape):
+    """A gradient paint for shape from a <linearGradient>/<radialGradient>."""
+    stops = []
+    for stop in el.findall("stop"):
+        opacity = float(stop.get("stop-opacity", 1))
+        stops.append([_num(_fraction(stop.get("offset"), 0)),
+                      _color(str(stop.get("stop-color", "#000")), opacity)])
+    if el.tag == "linearGradient":
+        coords = [_fraction(el.get(k), d) for k, d in
+                  (("x1", 0), ("y1", 0), ("x2", "100%"), ("y2", 0))]
+        paint = {"type": "linear"}
+    else:
+        cx, cy = _fraction(el.get("cx"), "50%"), _fraction(el.get("cy"), "50%")
+        r = _fraction(el.get("r"), "50%")
+        fx, fy = _fraction(el.get("fx"), cx), _fraction(el.get("fy"), cy)
+        coords = [fx, fy, 0, cx, cy, r]
+        paint = {"type": "radial"}
+    paint["coords"] = [_num(c) for c in coords]
+    paint["stops"] = stops
+    matrix = parse_transform(el.get("gradientTransform"))
+    if el.get("gradientUnits") != "userSpaceOnUse":
+        box = _bbox(shape)
+        if box is None:
+            raise ValueError(f"gradient #{el.get('id')} on a shape without known bounds")
+        matrix = _multiply((box[2] - box[0], 0, 0, box[3] - box[1], box[0], box[1]), matrix)
+    if matrix != IDENTITY:
+        paint["matrix"] = _matrix(matrix)
+    return paint
+
+
+def _paint(value, scope, fragments, shape):
+    value = str(value)
+    if value == "none":
+        return None
+    if value == "currentColor":
+        value = str(scope.get("color") or "#000")
+    ref = _URL.fullmatch(value)
+    if ref:
+        el = fragments.get(ref.group(1))
+        if el is None or el.tag not in ("linearGradient", "radialGradient"):
+            raise ValueError(f"unsupported paint {value}")
+        return _gradient(el, fragments, shape)
+    return _color(value)
+
+
+def _shape(el, dx, dy):
+    """[kind, *args] for a leaf, moved by dx, dy."""
+    g = lambda key, default=0: float(el.get(key, default))
+    if el.tag == "circle":
+        return ["circle", _num(g("cx") + dx), _num(g("cy") + dy), _num(g("r"))]
+    if el.tag == "ellipse":
+        return ["ellipse", _num(g("cx") + dx), _num(g("cy") + dy), _num(g("rx")), _num(g("ry"))]
+    if el.tag == "rect":
+        w, h = g("width"), g("height")
+        shape = ["rect", _num(g("x") + dx), _num(g("y") + dy), _num(w), _num(h)]
+        rx, ry = el.get("rx"), el.get("ry")
+        if rx is not None or ry is not None:
+            rx = float(rx if rx is not None else ry)
+            ry = float(ry if ry is not None else rx)
+            shape += [_num(min(rx, w / 2)), _num(min(ry, h / 2))]
+        return shape
+    if el.tag == "line":
+        return ["line", _num(g("x1") + dx), _num(g("y1") + dy), _num(g("x2") + dx), _num(g("y2") + dy)]
+    if el.tag in ("polygon", "polyline"):
+        numbers = [float(n) for n in svgopt._NUMBER.findall(str(el.get("points", "")))]
+        return [el.tag, [_num(n + (dy if i % 2 else dx)) for i, n in enumerate(numbers)]]
+    if el.tag == "path":
+        d = str(el.get("d", ""))
+        return ["path", translate_path(d, dx, dy) if dx or dy else d]
+    if el.tag == "text":
+        size = el.get("font-size", "16")
+        font = f"{size}px {el.get('font-family', 'sans-serif')}"
+        return ["text", _num(g("x") + dx), _num(g("y") + dy), el.text or "", font,
+                ALIGN.get(str(el.get("text-anchor", "start")), "start")]
+    return None
+
+
+def _style(el, scope, fragments, matrix, alpha, shape):
+    style = {}
+    fill = _paint(el.get("fill", scope["fill"]), scope, fragments, shape)
+    if fill is not None and shape[0] != "line":
+        style["fill"] = fill
+        if float(el.get("fill-opacity", scope["fill-opacity"])) != 1:
+            style["fillAlpha"] = _num(el.get("fill-opacity", scope["fill-opacity"]))
+    stroke = _paint(el.get("stroke", scope["stroke"]), scope, fragments, shape)
+    if stroke is not None:
+        style["stroke"] = stroke
+        style["lineWidth"] = _num(el.get("stroke-width", scope["stroke-width"]))
+        for key, name in (("stroke-linecap", "lineCap"), ("stroke-linejoin", "lineJoin")):
+            value = el.get(key, scope[key])
+            if value != svgopt.DEFAULTS[key]:
+                style[name] = value
+        if float(el.get("stroke-opacity", scope["stroke-opacity"])) != 1:
+            style["strokeAlpha"] = _num(el.get("stroke-opacity", scope["stroke-opacity"]))
+    if not style:
+        return None
+    alpha *= float(el.get("opacity", 1))
+    if alpha != 1:
+        style["alpha"] = _num(alpha)
+    if matrix[:4] != IDENTITY[:4]:
+        style["transform"] = _matrix(matrix)
+    return style
+
+
+def _inner(el, scope):
+    inner = dict(scope)
+    inner.update((k, el.get(k)) for k in svgopt.INHERITED + ("color",) if k in el.attrib)
+    return inner
+
+
+def _walk(el, scope, fragments, matrix, alpha, out, depth=0):
+    if el.tag in ("defs", "title", "desc", "metadata") or alpha == 0:
+        return
+    unsupported = UNSUPPORTED & el.attrib.keys()
+    if unsupported:
+        raise ValueError(f"<{el.tag}> uses {', '.join(sorted(unsupported))}, which canvas.py cannot draw")
+    if "transform" in el.attrib:
+        matrix = _multiply(matrix, parse_transform(el.get("transform")))
+    if el.tag in svgopt.GROUPS or el.tag == "use":
+        scope = _inner(el, scope)
+        if el.tag == "use":
+            if depth > 32:
+                raise ValueError("<use> nesting too deep")
+            ref = fragments.get(str(el.get("href", el.get("xlink:href", "")))[1:])
+            if ref is None:
+                return
+            moved = _multiply(matrix, (1, 0, 0, 1, float(el.get("x", 0)), float(el.get("y", 0))))
+            _walk(ref, scope, fragments, moved, alpha * float(el.get("opacity", 1)), out, depth + 1)
+            return
+        if el.tag != "svg":
+            alpha *= float(el.get("opacity", 1))
+        for child in el:
+            _walk(child, scope, fragments, matrix, alpha, out, depth)
+        return
+    translated = matrix[:4] == IDENTITY[:4]
+    shape = _shape(el, matrix[4] if translated else 0, matrix[5] if translated else 0)
+    if shape is None:
+        return
+    style = _style(el, scope, fragments, matrix, alpha, shape)
+    if style is not None:
+        out.append([style, *shape])
+
+
+def commands(root):
+    """The draw commands of a token tree, as [style dict, kind, *args] lists."""
+    fragments = {n.get("id"): n for n in root.iter() if n.get("id")}
+    scope = dict(svgopt.DEFAULTS, color=None)
+    out = []
+    _walk(root, scope, fragments, IDENTITY, 1.0, out)
+    return out
+
+
+def view_box(root):
+    return [_num(n) for n in str(root.get("viewBox", "0 0 200 200")).split()]
+
+
+def bundle(tokens):
+    """One document for {slug: {"viewBox", "commands"}}, styles shared by index.
+
+    Styles are numbered in order of first use, so the same tokens give the
+    same document.
+    """
+    styles, index, packed = [], {}, {}
+    for slug, token in tokens.items():
+        commands = []
+        for style, *shape in token["commands"]:
+            key = repr(sorted((k, repr(v)) for k, v in style.items()))
+            if key not in index:
+                index[key] = len(styles)
+                styles.append(style)
+            commands.append([index[key], *shape])
+        packed[slug] = {"viewBox": token["viewBox"], "commands": commands}
+    return {"version": VERSION, "styles": styles, "tokens": packed}
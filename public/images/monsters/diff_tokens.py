@@ -0,0 +1,227 @@
+"""Rasterize every token and diff it against stored baseline renders.
+
+Tokens (and, with --variants, every variant in a spec file) are built and
+rasterized in a process pool, then compared against the baseline PNGs
+(.tokens-dev/diff-baseline/ at the repository root) all at once as NumPy
+arrays. Two measures decide a pass:
+
+  changed   share of pixels whose worst channel moved more than
+            --pixel-threshold levels
+  delta-e   worst CIE76 colour difference after a 3x3 blur, composited
+            over white; the blur stands in for viewing at token size, so
+            anti-aliasing jitter along an edge scores low while a changed
+            colour or a moved shape does not
+
+Anything over tolerance gets a baseline | current | heat map image in
+.tokens-dev/diff-output/. Both stay out of public/, which is deployed.
+Typical use:
+
+    python3 diff_tokens.py --save       # before the change
+    python3 diff_tokens.py              # after it; exits 1 on regressions
+    python3 diff_tokens.py --no-optimize --save && python3 diff_tokens.py
+                                        # check the optimizer is lossless
+"""
+import argparse, concurrent.futures, io, json, os, pathlib, sys, time
+
+import numpy as np
+
+import gen_tokens, output, scene, svgopt, variants
+
+BASELINE = gen_tokens.DEV_DIR / "diff-baseline"
+DIFF_DIR = gen_tokens.DEV_DIR / "diff-output"
+SIZE = 128  # px; the size tokens are most often drawn at on the map
+
+# sRGB (linear) -> XYZ, and the D65 white point it is normalised by.
+XYZ = np.array([[0.4124, 0.3576, 0.1805],
+                [0.2126, 0.7152, 0.0722],
+                [0.0193, 0.1192, 0.9505]], dtype=np.float32)
+WHITE = XYZ.sum(axis=1)
+
+
+def decode(png):
+    from PIL import Image
+    return np.asarray(Image.open(io.BytesIO(png)).convert("RGBA"))
+
+
+def encode(pixels, optimize=True):
+    from PIL import Image
+    buf = io.BytesIO()
+    Image.fromarray(pixels).save(buf, "PNG", optimize=optimize)
+    return buf.getvalue()
+
+
+def render_job(job):
+    """Build and rasterize one token or one variant spec; return [(name, RGBA array)]."""
+    kind, spec, size, optimize = job
+    render = gen_tokens.rasterizer()
+    if kind == "token":
+        root = svgopt.inline_fragments(gen_tokens.MONSTERS[spec]())
+        if optimize:
+            svgopt.optimize(root)
+        return [(spec, decode(render(scene.serialize(root).encode(), size)))]
+    return [(name.removesuffix(".svg"), decode(render(data, size)))
+            for name, data in variants.render_all([spec], optimize)]
+
+
+def render_all(jobs, workers):
+    """Yield (name, pixels) for every job, fanning out over a process pool."""
+    if workers <= 1 or len(jobs) <= 1:
+        for batch in map(render_job, jobs):
+            yield from batch
+        return
+    chunksize = max(1, len(jobs) // (workers * 4))
+    with concurrent.futures.ProcessPoolExecutor(workers) as pool:
+        for batch in pool.map(render_job, jobs, chunksize=chunksize):
+            yield from batch
+
+
+def linearize(rgba):
+    """Linear-light RGB of RGBA pixels (..., 4) composited over white."""
+    rgba = rgba.astype(np.float32) / 255
+    alpha = rgba[..., 3:]
+    rgb = rgba[..., :3] * alpha + (1 - alpha)
+    return np.where(rgb <= 0.04045, rgb / 12.92, ((rgb + 0.055) / 1.055) ** 2.4)
+
+
+def lab(linear):
+    """CIE Lab of linear-light RGB pixels (..., 3)."""
+    t = (linear @ XYZ.T) / WHITE
+    f = np.where(t > (6 / 29) ** 3, np.cbrt(t), t / (3 * (6 / 29) ** 2) + 4 / 29)
+    return np.stack([116 * f[..., 1] - 16,
+                     500 * (f[..., 0] - f[..., 1]),
+                     200 * (f[..., 1] - f[..., 2])], axis=-1)
+
+
+def blur(images):
+    """3x3 box blur of (N, H, W, C) images, edges clamped."""
+    padded = np.pad(images, ((0, 0), (1, 1), (1, 1), (0, 0)), mode="edge")
+    h, w = images.shape[1:3]
+    return sum(padded[:, dy:dy + h, dx:dx + w] for dy in range(3) for dx in range(3)) / 9
+
+
+def compare(before, after, pixel_threshold):
+    """Diff stacks of RGBA renders (N, H, W, 4) in one pass.
+
+    Returns the per-pixel worst-channel deltas (N, H, W) and, per image,
+    the changed-pixel share, the largest delta and the largest blurred
+    delta-e.
+    """
+    delta = np.abs(before.astype(np.int16) - after.astype(np.int16)).max(axis=-1)
+    changed = (delta > pixel_threshold).mean(axis=(1, 2))
+    # Blur in linear light, where the eye averages neighbouring pixels.
+    diff = lab(blur(linearize(before))) - lab(blur(linearize(after)))
+    delta_e = np.sqrt((diff ** 2).sum(axis=-1))
+    return delta, changed, delta.max(axis=(1, 2)), delta_e.max(axis=(1, 2))
+
+
+def diff_image(before, after, delta):
+    """baseline | current | heat map of the changed pixels over a faded current."""
+    faded = (after[..., :3].astype(np.float32).mean(axis=-1) * 0.3 + 170).astype(np.uint8)
+    heat = np.stack([faded] * 3 + [np.full_like(faded, 255)], axis=-1)
+    hot = delta > 0
+    heat[hot] = np.stack([np.full(hot.sum(), 255), 255 - np.minimum(delta[hot] * 4, 255),
+                          np.zeros(hot.sum()), np.full(hot.sum(), 255)], axis=-1)
+    return np.concatenate([before, after, heat], axis=1)
+
+
+def load_baseline(directory, names):
+    """Baseline pixels by name for every name with a stored render."""
+    baseline = {}
+    for name in names:
+        try:
+            baseline[name] = decode((directory / f"{name}.png").read_bytes())
+        except FileNotFoundError:
+            pass
+    return baseline
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--only", metavar="SLUGS", help="comma-separated slugs (default: all)")
+    parser.add_argument("--variants", type=pathlib.Path, metavar="SPEC",
+                        help="also diff every variant in this variants.py spec file")
+    parser.add_argument("--size", type=int, default=SIZE, help="render size in px (default: %(default)s)")
+    parser.add_argument("-j", "--jobs", type=int, default=0, metavar="N",
+                        help="render in N worker processes (default 0: one per CPU)")
+    parser.add_argument("--no-optimize", dest="optimize", action="store_false",
+                        help="render the builders' markup without the SVG optimizer")
+    parser.add_argument("--baseline", type=pathlib.Path, default=BASELINE,
+                        help="directory of baseline renders (default: %(default)s)")
+    parser.add_argument("--diff-dir", type=pathlib.Path, default=DIFF_DIR,
+                        help="where diff images go (default: %(default)s)")
+    parser.add_argument("--save", action="store_true", help="store the renders as the new baseline")
+    parser.add_argument("--pixel-threshold", type=int, default=16,
+                        help="channel levels a pixel may move before it counts as changed "
+                             "(default: %(default)s)")
+    parser.add_argument("--tolerance", type=float, default=0.5,
+                        help="allowed %% of changed pixels per image (default: %(default)s)")
+    parser.add_argument("--delta-e", type=float, default=2.3,
+                        help="allowed blurred CIE76 colour difference (default: %(default)s, "
+                             "about one just-noticeable difference)")
+    args = parser.parse_args(argv)
+    if args.jobs < 0:
+        parser.error("--jobs must be >= 0")
+    args.jobs = args.jobs or os.cpu_count() or 1
+    args.slugs = [s.strip() for s in args.only.split(",")] if args.only else list(gen_tokens.MONSTERS)
+    unknown = [s for s in args.slugs if s not in gen_tokens.MONSTERS]
+    if unknown:
+        parser.error(f"unknown slug(s): {', '.join(unknown)}")
+    try:
+        gen_tokens.rasterizer()
+    except RuntimeError as e:
+        parser.error(str(e))
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    start = time.perf_counter()
+    jobs = [("token", slug, args.size, args.optimize) for slug in args.slugs]
+    if args.variants:
+        jobs += [("variant", spec, args.size, args.optimize)
+                 for spec in json.loads(args.variants.read_text())]
+    current = dict(render_all(jobs, args.jobs))
+    rendered = time.perf_counter()
+
+    if args.save:
+        with output.DirectoryWriter(args.baseline) as writer:
+            written = sum(writer.write(f"{name}.png", encode(pixels)) for name, pixels in current.items())
+            if not args.only and not args.variants:
+                for stale in sorted(args.baseline.glob("*.png")):
+                    if stale.stem not in current:
+                        writer.delete(stale.name)
+        print(f"Saved {written} of {len(current)} renders to {args.baseline} "
+              f"in {(time.perf_counter() - start):.2f} s")
+        return 0
+
+    baseline = load_baseline(args.baseline, current)
+    new = sorted(current.keys() - baseline.keys())
+    names = sorted(n for n in baseline if baseline[n].shape == current[n].shape)
+    resized = sorted(baseline.keys() - set(names))
+    failed = []
+    if names:
+        before = np.stack([baseline[n] for n in names])
+        after = np.stack([current[n] for n in names])
+        delta, changed, worst, delta_e = compare(before, after, args.pixel_threshold)
+        over = (changed * 100 > args.tolerance) | (delta_e > args.delta_e)
+        with output.DirectoryWriter(args.diff_dir, durable=False) as writer:
+            for i in np.flatnonzero(over):
+                name = names[i]
+                writer.write(f"{name}.png", encode(diff_image(before[i], after[i], delta[i]), optimize=False))
+                failed.append(name)
+                print(f"  CHANGED {name}: {changed[i] * 100:.2f}% of pixels, "
+                      f"max delta {worst[i]}, delta-e {delta_e[i]:.1f}")
+    for name in new:
+        print(f"  new {name} (no baseline)")
+    for name in resized:
+        print(f"  resized {name}: baseline is {baseline[name].shape[1]} px; run --save")
+    print(f"\n{len(names)} compared, {len(failed)} over tolerance, {len(new)} new "
+          f"(render {rendered - start:.2f} s, diff {time.perf_counter() - rendered:.2f} s)")
+    if failed:
+        print(f"diff images in {args.diff_dir}", file=sys.stderr)
+    return 1 if failed or resized else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,366 @@
+"""Find adjacency bugs between token helper calls and string literals.
+
+Monster builders are long argument lists of helper calls (ellipse(...),
+eyes(...), any function the file defines or imports by name), so a lost
+or stray character between two elements still parses but breaks or
+silently changes the token:
+
+  missing-comma   a call or subscript applied to a helper call that ended
+                  on an earlier line: ellipse(...)\\n(circle(...)) calls
+                  the first result           (fix: insert the comma)
+  unary-op        + or - applied to a helper call or string literal
+                                             (fix: drop the operator)
+  plus-join       helper call + helper call/string directly inside an
+                  argument list              (fix: replace + with a comma)
+  implicit-concat adjacent string literals forming one positional helper
+                  argument, "#a" "#b"        (reported only)
+
+Monster art lives in definitions/<slug>.json, whose layers gen_tokens.py
+turns into helper calls, so those files are checked against the helpers
+it exposes:
+
+  unknown-helper  a layer naming no helper in gen_tokens.HELPERS
+  bad-arity       arguments the helper's signature does not accept
+  bad-color       a colour attribute or argument (fill, stroke, iris, the
+                  background, ...) that is not #rgb, #rrggbb, none,
+                  currentColor, url(#id) or a known colour name
+  bad-layer       a layer that is neither [helper, ...] nor a "# ..."
+                  comment
+  bad-id          monsterId other than "mon-<slug>", the id the app and
+                  the art pipeline use  (fix: rewrite it)
+
+Each file is parsed once per check. Results are cached by content hash
+in .lint-cache.json, so an unchanged file costs one hash.
+
+    python3 lint_tokens.py [--fix] [--no-cache] [FILE ...]
+
+Exits 1 if any issue remains, so it can run as a pre-commit hook.
+"""
+import argparse, ast, bisect, collections, hashlib, inspect, io, json, os, pathlib, re, sys, tokenize
+
+HERE = pathlib.Path(__file__).parent
+DEFAULT_FILES = [HERE / "gen_tokens.py", HERE / "bestiary.py",
+                 *sorted((HERE / "definitions").glob("*.json"))]
+CACHE_FILE = HERE / ".lint-cache.json"
+# Cache entries are only valid for the rules that produced them, and
+# definitions are checked against the helpers gen_tokens.py exposes.
+RULES_VERSION = hashlib.sha256(b"".join(
+    (HERE / name).read_bytes() for name in (pathlib.Path(__file__).name, "gen_tokens.py", "scene.py")
+)).hexdigest()[:16]
+# Helper parameters and attributes that take a colour.
+COLOR_KEYS = {"fill", "stroke", "color", "stop-color", "flood-color", "iris", "pupil"}
+COLOR = re.compile(r"#[0-9a-fA-F]{3}|#[0-9a-fA-F]{6}|none|currentColor|url\(#[\w-]+\)")
+
+Issue = collections.namedtuple("Issue", "line col code message fix")
+# A fix replaces source[start:end] (character offsets) with text.
+Fix = collections.namedtuple("Fix", "start end text")
+
+
+def helper_names(tree):
+    """Names of functions the module defines or imports by name."""
+    names = set()
+    for node in tree.body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            names.add(node.name)
+        elif isinstance(node, ast.ImportFrom):
+            names.update(alias.asname or alias.name for alias in node.names)
+    return names
+
+
+class Checker(ast.NodeVisitor):
+    def __init__(self, source, tree, tokens):
+        self.helpers = helper_names(tree)
+        self.tokens = tokens
+        self.positions = [pos for pos, _ in tokens]
+        self.issues = []
+        self.source = source
+        # ast columns are UTF-8 byte offsets; fixes work on str offsets.
+        self.lines = source.splitlines(keepends=True)
+        self.starts = [0]
+        for text in self.lines:
+            self.starts.append(self.starts[-1] + len(text))
+
+    def offset(self, line, col):
+        return self.starts[line - 1] + len(self.lines[line - 1].encode()[:col].decode())
+
+    def start(self, node):
+        return self.offset(node.lineno, node.col_offset)
+
+    def end(self, node):
+        return self.offset(node.end_lineno, node.end_col_offset)
+
+    def is_helper_call(self, node):
+        return (isinstance(node, ast.Call) and isinstance(node.func, ast.Name)
+                and node.func.id in self.helpers)
+
+    def is_element(self, node):
+        return self.is_helper_call(node) or (
+            isinstance(node, ast.Constant) and isinstance(node.value, str))
+
+    def report(self, node, code, message, fix=None):
+        self.issues.append(Issue(node.lineno, node.col_offset + 1, code, message, fix))
+
+    def tokens_between(self, start, end):
+        """(offset, token) pairs starting in source[start:end]."""
+        lo = bisect.bisect_left(self.positions, start)
+        hi = bisect.bisect_left(self.positions, end)
+        return self.tokens[lo:hi]
+
+    def visit_Call(self, node):
+        self.check_postfix(node, node.func)
+        if self.is_helper_call(node):
+            for arg in node.args:
+                strings = [t for t in self.tokens_between(self.start(arg), self.end(arg))
+                           if t[1].type == tokenize.STRING]
+                if isinstance(arg, ast.Constant) and len(strings) > 1:
+                    self.report(arg, "implicit-concat",
+                                f"adjacent string literals form one argument of {node.func.id}()")
+        self.check_joins(node.args)
+        self.generic_visit(node)
+
+    def visit_Subscript(self, node):
+        self.check_postfix(node, node.value)
+        self.generic_visit(node)
+
+    def visit_List(self, node):
+        self.check_joins(node.elts)
+        self.generic_visit(node)
+
+    visit_Tuple = visit_List
+
+    def check_postfix(self, node, inner):
+        """Flag ( or [ on a new line right after a helper call."""
+        if self.is_helper_call(inner) and node.end_lineno > inner.end_lineno:
+            opener = self.tokens_between(self.end(inner), self.end(node))[:1]
+            if opener and opener[0][1].start[0] > inner.end_lineno:
+                self.report(inner, "missing-comma",
+                            f"missing comma after this {inner.func.id}(): "
+                            f"line {opener[0][1].start[0]} is applied to its result",
+                            Fix(self.end(inner), self.end(inner), ","))
+
+    def visit_UnaryOp(self, node):
+        if isinstance(node.op, (ast.UAdd, ast.USub)) and self.is_element(node.operand):
+            self.report(node, "unary-op", "stray unary operator before a token element",
+                        Fix(self.start(node), self.start(node.operand), ""))
+        self.generic_visit(node)
+
+    def check_joins(self, elements):
+        for element in elements:
+            if (isinstance(element, ast.BinOp) and isinstance(element.op, ast.Add)
+                    and (self.is_helper_call(element.left) or self.is_helper_call(element.right))
+                    and self.is_element(element.left) and self.is_element(element.right)):
+                left_end = self.end(element.left)
+                plus = [(pos, t) for pos, t in self.tokens_between(
+                    left_end, self.start(element.right)) if t.string == "+"]
+                fix = None
+                if len(plus) == 1:
+                    pos = plus[0][0]
+                    gap = self.source[left_end:pos]
+                    fix = Fix(left_end if gap.isspace() or not gap else pos, pos + 1, ",")
+                self.report(element, "plus-join", "+ between token elements; use a comma", fix)
+
+
+def check_source(source):
+    """Return the Issues in source, in line order."""
+    tree = ast.parse(source)
+    starts = [0]
+    for text in source.splitlines(keepends=True):
+        starts.append(starts[-1] + len(text))
+    skip = {tokenize.NL, tokenize.NEWLINE, tokenize.COMMENT,
+            tokenize.INDENT, tokenize.DEDENT, tokenize.ENDMARKER}
+    tokens = [(starts[tok.start[0] - 1] + tok.start[1], tok)
+              for tok in tokenize.generate_tokens(io.StringIO(source).readline)
+              if tok.type not in skip]
+    checker = Checker(source, tree, tokens)
+    checker.visit(tree)
+    return sorted(checker.issues, key=lambda i: (i.line, i.col))
+
+
+class DefinitionChecker:
+    """Checks a definition file, parsed as the Python literal JSON is."""
+
+    def __init__(self, source, slug, helpers, named_colors):
+        self.source = source
+        self.slug = slug
+        self.helpers = helpers
+        self.named_colors = named_colors
+        self.issues = []
+        self.starts = [0]
+        for text in source.splitlines(keepends=True):
+            self.starts.append(self.starts[-1] + len(text))
+
+    def report(self, node, code, message, fix=None):
+        self.issues.append(Issue(node.lineno, node.col_offset + 1, code, message, fix))
+
+    def span(self, node):
+        return (self.starts[node.lineno - 1] + node.col_offset,
+                self.starts[node.end_lineno - 1] + node.end_col_offset)
+
+    def check(self, root):
+        if not isinstance(root, ast.Dict):
+            self.report(root, "bad-layer", "a definition is an object")
+            return
+        fields = {k.value: v for k, v in zip(root.keys, root.values) if isinstance(k, ast.Constant)}
+        want = f"mon-{self.slug}"
+        ident = fields.get("monsterId")
+        if ident is None:
+            self.report(root, "bad-id", f'missing "monsterId": "{want}"')
+        elif not (isinstance(ident, ast.Constant) and ident.value == want):
+            self.report(ident, "bad-id", f'monsterId should be "{want}"',
+                        Fix(*self.span(ident), json.dumps(want)))
+        background = fields.get("background")
+        if not (isinstance(background, ast.List) and len(background.elts) == 2):
+            self.report(background or root, "bad-layer", "background is a list of two colours")
+        else:
+            for node in background.elts:
+                self.check_color(node, "background")
+        layers = fields.get("layers")
+        if not isinstance(layers, ast.List):
+            self.report(layers or root, "bad-layer", "layers is a list")
+            return
+        for layer in layers.elts:
+            self.check_layer(layer)
+
+    def check_layer(self, node):
+        if isinstance(node, ast.Constant) and isinstance(node.value, str):
+            if not node.value.startswith("#"):
+                self.report(node, "bad-layer", 'a bare string layer must be a "# ..." comment')
+            return
+        if not (isinstance(node, ast.List) and node.elts and isinstance(node.elts[0], ast.Constant)
+                and isinstance(node.elts[0].value, str)):
+            self.report(node, "bad-layer", "a layer is [helper, *args, {attributes}]")
+            return
+        name, *args = node.elts
+        attrs = args.pop() if args and isinstance(args[-1], ast.Dict) else None
+        for arg in args:
+            if isinstance(arg, ast.List):
+                self.check_layer(arg)
+        helper = self.helpers.get(name.value)
+        if helper is None:
+            self.report(name, "unknown-helper", f"no helper named {name.value!r}")
+            return
+        keywords = {} if attrs is None else {
+            k.value: v for k, v in zip(attrs.keys, attrs.values) if isinstance(k, ast.Constant)}
+        signature = inspect.signature(helper)
+        try:
+            bound = signature.bind(*args, **keywords)
+        except TypeError as e:
+            self.report(node, "bad-arity", f"{name.value}(): {e}")
+            return
+        for param, value in bound.arguments.items():
+            kind = signature.parameters[param].kind
+            if kind == inspect.Parameter.VAR_KEYWORD:
+                for key, node in value.items():
+                    if key.replace("_", "-") in COLOR_KEYS:
+                        self.check_color(node, key)
+            elif kind != inspect.Parameter.VAR_POSITIONAL and param in COLOR_KEYS:
+                self.check_color(value, param)
+
+    def check_color(self, node, what):
+        value = node.value if isinstance(node, ast.Constant) else None
+        if not isinstance(value, str) or not (COLOR.fullmatch(value) or value in self.named_colors):
+            self.report(node, "bad-color", f"{what} {ast.get_source_segment(self.source, node)} "
+                                           f"is not a colour")
+
+
+def check_definition(source, slug):
+    """Return the Issues in definitions/<slug>.json, in line order."""
+    import gen_tokens, svgopt
+    try:
+        json.loads(source)
+    except ValueError as e:
+        return [Issue(e.lineno, e.colno, "syntax-error", e.msg, None)]
+    checker = DefinitionChecker(source, slug, gen_tokens.HELPERS, svgopt.NAMED_COLORS)
+    checker.check(ast.parse(source, mode="eval").body)
+    return sorted(checker.issues, key=lambda i: (i.line, i.col))
+
+
+def check_file(path, source):
+    if path.suffix == ".json":
+        return check_definition(source, path.stem)
+    return check_source(source)
+
+
+def apply_fixes(source, issues):
+    """Apply every fix, last first so earlier offsets stay valid."""
+    for fix in sorted({i.fix for i in issues if i.fix}, key=lambda f: f.start, reverse=True):
+        source = source[:fix.start] + fix.text + source[fix.end:]
+    return source
+
+
+def load_cache(path):
+    try:
+        cache = json.loads(path.read_text())
+    except (FileNotFoundError, ValueError):
+        return {}
+    return cache.get("entries", {}) if cache.get("rules") == RULES_VERSION else {}
+
+
+def save_cache(path, entries):
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps({"rules": RULES_VERSION, "entries": entries}, indent=2) + "\n")
+    os.replace(tmp, path)
+
+
+def lint_file(path, cache, fix=False):
+    """Check (and with fix, repair) one file; return its remaining Issues.
+
+    Fixes are applied in passes, since one fix can expose another (a
+    stray + in front of a missing comma), for as long as the result
+    still parses and has fewer issues; only then is the file written.
+    """
+    data = path.read_bytes()
+    digest = hashlib.sha256(data).hexdigest()
+    entry = cache.get(str(path))
+    if entry and entry["sha256"] == digest and not (fix and any(i[4] for i in entry["issues"])):
+        return [Issue(*i[:4], Fix(*i[4]) if i[4] else None) for i in entry["issues"]]
+    source = data.decode()
+    try:
+        issues = check_file(path, source)
+    except SyntaxError as e:
+        return [Issue(e.lineno or 1, e.offset or 1, "syntax-error", e.msg, None)]
+    fixed, remaining = source, issues
+    while fix and any(i.fix for i in remaining):
+        candidate = apply_fixes(fixed, remaining)
+        try:
+            after = check_file(path, candidate)
+        except SyntaxError:
+            break
+        if len(after) >= len(remaining):
+            break
+        fixed, remaining = candidate, after
+    if fixed != source:
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        tmp.write_text(fixed)
+        os.replace(tmp, path)
+        print(f"{path.name}: applied fixes, {len(remaining)} issue(s) left")
+        digest = hashlib.sha256(fixed.encode()).hexdigest()
+        issues = remaining
+    cache[str(path)] = {"sha256": digest, "issues": [list(i) for i in issues]}
+    return issues
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("files", nargs="*", type=pathlib.Path, default=DEFAULT_FILES)
+    parser.add_argument("--fix", action="store_true", help="apply the safe fixes in place")
+    parser.add_argument("--no-cache", dest="cache", action="store_false",
+                        help=f"ignore and do not update {CACHE_FILE.name}")
+    args = parser.parse_args(argv)
+    cache = load_cache(CACHE_FILE) if args.cache else {}
+    total = 0
+    for path in args.files:
+        for issue in lint_file(path.resolve(), cache, args.fix):
+            hint = " (fixable with --fix)" if issue.fix else ""
+            print(f"{path}:{issue.line}:{issue.col}: {issue.code} {issue.message}{hint}")
+            total += 1
+    if args.cache:
+        save_cache(CACHE_FILE, cache)
+    if total:
+        print(f"{total} issue(s)", file=sys.stderr)
+    return 1 if total else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
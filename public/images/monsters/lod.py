@@ -0,0 +1,138 @@
+"""Level-of-detail pruning: drop shapes too small to see at a render size.
+
+A shape's visible area is its painted area in viewBox units (fill
+interior plus stroke length times width), scaled by its opacity and by
+the square of px per unit at the target size. Shapes below the threshold
+are removed, and fragments left unreferenced go with them.
+"""
+import math, re
+
+import svgopt
+
+# (level, target px): a level is pruned for its size and is valid for any
+# render at or below it; "full" is every size above the smallest target.
+LEVELS = (("medium", 64), ("minimal", 32))
+THRESHOLD = 1.0  # px^2: smaller than one pixel of coverage
+_REF = re.compile(r"url\(#([^)]+)\)")
+
+
+def _polygon_area(points):
+    return abs(sum(x0 * y1 - x1 * y0 for (x0, y0), (x1, y1)
+                   in zip(points, points[1:] + points[:1]))) / 2
+
+
+def _length(points, closed=False):
+    if closed:
+        points = points + points[:1]
+    return sum(math.dist(a, b) for a, b in zip(points, points[1:]))
+
+
+def _outline(el):
+    """(subpaths of points, closed) for outlined shapes, else None."""
+    if el.tag == "path":
+        subpaths = svgopt.path_points(str(el.get("d", "")))
+        return (subpaths, "z" in str(el.get("d")).lower()) if subpaths else None
+    if el.tag == "line":
+        coords = [float(el.get(k, 0)) for k in ("x1", "y1", "x2", "y2")]
+        return [[tuple(coords[:2]), tuple(coords[2:])]], False
+    if el.tag in ("polygon", "polyline"):
+        # A points list reads as path data once it starts with a moveto.
+        subpaths = svgopt.path_points("M" + str(el.get("points", "")).replace(",", " "))
+        return (subpaths, el.tag == "polygon") if subpaths else None
+    return None
+
+
+def painted_area(el, scope, fragments):
+    """Visible area of a leaf in viewBox units, or None when it cannot be judged."""
+    try:
+        opacity = float(el.get("opacity", 1))
+        fill = el.get("fill", scope["fill"]) != "none" and el.tag != "line"
+        stroke = el.get("stroke", scope["stroke"]) != "none"
+        width = float(el.get("stroke-width", scope["stroke-width"])) if stroke else 0.0
+        if el.tag == "use":
+            ref = fragments.get(str(el.get("href", ""))[1:])
+            if ref is None:
+                return None
+            inner = dict(scope, **{k: el.get(k) for k in svgopt.INHERITED if k in el.attrib})
+            areas = [painted_area(child, inner, fragments)
+                     for child in (list(ref) if ref.tag == "g" else [ref])]
+            return None if None in areas or not areas else max(areas) * opacity
+        if el.tag in ("circle", "ellipse"):
+            rx = float(el.get("r" if el.tag == "circle" else "rx"))
+            ry = float(el.get("r" if el.tag == "circle" else "ry"))
+            interior = math.pi * rx * ry
+            perimeter = math.pi * (3 * (rx + ry) - math.sqrt((3 * rx + ry) * (rx + 3 * ry)))
+        elif el.tag == "rect":
+            w, h = float(el.get("width")), float(el.get("height"))
+            interior, perimeter = w * h, 2 * (w + h)
+        else:
+            outline = _outline(el)
+            if outline is None:
+                return None
+            subpaths, closed = outline
+            interior = sum(_polygon_area(sub) for sub in subpaths if len(sub) > 2)
+            perimeter = sum(_length(sub, closed) for sub in subpaths)
+    except (TypeError, ValueError):
+        return None
+    return ((interior if fill else 0.0) + perimeter * width) * opacity
+
+
+def _prune(parent, scope, fragments, min_area):
+    dropped = 0
+    for child in list(parent):
+        if child.tag == "defs" or "id" in child.attrib:
+            continue
+        if child.tag in svgopt.GROUPS:
+            inner = dict(scope)
+            inner.update((k, child.get(k)) for k in svgopt.INHERITED if k in child.attrib)
+            factor = float(child.get("opacity", 1))
+            dropped += _prune(child, inner, fragments, min_area / factor if factor else math.inf)
+            if not len(child):
+                parent.remove(child)
+            continue
+        if child.tag not in svgopt.SHAPES and child.tag != "use":
+            continue
+        area = painted_area(child, scope, fragments)
+        if area is not None and area < min_area:
+            parent.remove(child)
+            dropped += 1
+    return dropped
+
+
+def _drop_unused(root):
+    """Remove <defs> entries nothing references any more."""
+    for defs in list(root.iter("defs")):
+        while True:
+            refs = set()
+            for el in root.iter():
+                for key, value in el.attrib.items():
+                    value = str(value)
+                    if key == "href" and value.startswith("#"):
+                        refs.add(value[1:])
+                    refs.update(_REF.findall(value))
+            unused = [n for n in defs if n.get("id") and n.get("id") not in refs]
+            if not unused:
+                break
+            for node in unused:
+                defs.remove(node)
+        if not len(defs):
+            for parent in root.iter():
+                if defs in parent.children:
+                    parent.remove(defs)
+                    break
+
+
+def prune(root, size, threshold=THRESHOLD):
+    """Drop every shape under threshold px^2 when root is drawn size px wide.
+
+    Works on the unoptimized tree, so each primitive is judged on its own
+    before the optimizer merges it with others. Returns the count dropped.
+    """
+    view = [float(n) for n in str(root.get("viewBox", "0 0 200 200")).split()]
+    units_per_px = view[2] / size
+    fragments = {n.get("id"): n for d in root.iter("defs") for n in d if n.get("id")}
+    scope = dict(svgopt.DEFAULTS)
+    dropped = _prune(root, scope, fragments, threshold * units_per_px ** 2)
+    if dropped:
+        _drop_unused(root)
+    return dropped
@@ -0,0 +1,182 @@
+"""Atomic, batched writers for generated files: a directory or a bundle."""
+import gzip, io, os, pathlib, tarfile, zipfile
+
+FSYNC_BATCH = 64  # files renamed into place per round of directory fsyncs
+
+
+class DirectoryWriter:
+    """Write files under root atomically, skipping ones whose bytes match.
+
+    Each write lands in a temp file beside its target. Every FSYNC_BATCH
+    writes, and on flush/close, the batch is fsynced, renamed into place
+    and each directory it touched is fsynced once, so a crash leaves every
+    file either old or new and durability costs one directory sync per
+    batch rather than per file. durable=False skips the fsyncs.
+    """
+    incremental = True
+
+    def __init__(self, root, durable=True, batch=FSYNC_BATCH):
+        self.root = pathlib.Path(root)
+        self.durable = durable
+        self.batch = batch
+        self.pending = {}  # target path -> (fd, temp path)
+        self.written = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def exists(self, name):
+        path = self.root / name
+        return path in self.pending or path.exists()
+
+    def read(self, name):
+        path = self.root / name
+        if path in self.pending:
+            self.flush()
+        try:
+            return path.read_bytes()
+        except FileNotFoundError:
+            return None
+
+    def write(self, name, data):
+        """Stage data for root/name; return False if it already holds it."""
+        path = self.root / name
+        if path in self.pending:
+            self.flush()
+        try:
+            if path.stat().st_size == len(data) and path.read_bytes() == data:
+                return False
+        except FileNotFoundError:
+            path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+        self.pending[path] = (fd, tmp)
+        self.written += 1
+        if len(self.pending) >= self.batch:
+            self.flush()
+        return True
+
+    def delete(self, name):
+        """Remove root/name, and any directories under root it leaves empty."""
+        path = self.root / name
+        if path in self.pending:
+            self.flush()
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            return False
+        parent = path.parent
+        while parent != self.root and self.root in parent.parents:
+            try:
+                parent.rmdir()
+            except OSError:
+                break
+            parent = parent.parent
+        if self.durable:
+            _fsync_dir(parent)
+        return True
+
+    def flush(self):
+        dirs = set()
+        for path, (fd, tmp) in self.pending.items():
+            try:
+                if self.durable:
+                    os.fsync(fd)
+            finally:
+                os.close(fd)
+            os.replace(tmp, path)
+            dirs.add(path.parent)
+        self.pending.clear()
+        if self.durable:
+            for directory in dirs:
+                _fsync_dir(directory)
+
+    def close(self):
+        self.flush()
+
+
+class BundleWriter:
+    """Collect files into one .zip, .tar or .tar.gz archive, written on close.
+
+    Members get fixed timestamps and are stored in name order, so the same
+    inputs give byte-identical bundles. There is nothing to compare
+    against, so every write counts as a change; a bundle nothing was
+    written to (a dry run) is not created.
+    """
+    incremental = False
+
+    def __init__(self, path, root):
+        self.path = pathlib.Path(path)
+        self.root = pathlib.Path(root)  # where the bundle will be unpacked, for URLs
+        self.members = {}
+        self.written = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        if exc[0] is None:
+            self.close()
+
+    def exists(self, name):
+        return name in self.members
+
+    def read(self, name):
+        return self.members.get(name)
+
+    def write(self, name, data):
+        self.members[name] = bytes(data)
+        self.written += 1
+        return True
+
+    def delete(self, name):
+        return self.members.pop(name, None) is not None
+
+    def flush(self):
+        pass
+
+    def close(self):
+        if not self.members:
+            return
+        buf = io.BytesIO()
+        names = sorted(self.members)
+        if self.path.suffix == ".zip":
+            with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED, compresslevel=9) as archive:
+                for name in names:
+                    info = zipfile.ZipInfo(name, date_time=(1980, 1, 1, 0, 0, 0))
+                    info.compress_type = zipfile.ZIP_DEFLATED
+                    info.external_attr = 0o644 << 16
+                    archive.writestr(info, self.members[name])
+        else:
+            with tarfile.open(fileobj=buf, mode="w", format=tarfile.PAX_FORMAT) as archive:
+                for name in names:
+                    info = tarfile.TarInfo(name)
+                    info.size = len(self.members[name])
+                    info.mode = 0o644
+                    archive.addfile(info, io.BytesIO(self.members[name]))
+        data = buf.getvalue()
+        if self.path.name.endswith((".tar.gz", ".tgz")):
+            data = gzip.compress(data, compresslevel=9, mtime=0)
+        with DirectoryWriter(self.path.parent) as writer:
+            writer.write(self.path.name, data)
+
+
+def _fsync_dir(directory):
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def open_writer(root, bundle=None, durable=True):
+    """A BundleWriter when bundle is given, else a DirectoryWriter on root."""
+    if bundle:
+        return BundleWriter(bundle, root)
+    return DirectoryWriter(root, durable)
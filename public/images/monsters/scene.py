@@ -0,0 +1,176 @@
+"""Minimal SVG scene graph used to build, optimize and serialize tokens."""
+SVG_NS = "http://www.w3.org/2000/svg"
+
+
+class Node:
+    """One SVG element: tag, ordered attributes, child nodes and text.
+
+    The list-like interface (len, iteration, indexing, append, insert,
+    remove, find/findall/iter) mirrors xml.etree.ElementTree.Element so
+    tree passes read the same either way.
+    """
+    __slots__ = ("tag", "attrib", "children", "text")
+
+    def __init__(self, tag, attrib=None, children=None, text=None):
+        self.tag = tag
+        self.attrib = attrib if attrib is not None else {}
+        self.children = children if children is not None else []
+        self.text = text
+
+    def __repr__(self):
+        return f"<Node {self.tag} {self.attrib!r} ({len(self.children)} children)>"
+
+    def __len__(self):
+        return len(self.children)
+
+    def __iter__(self):
+        return iter(self.children)
+
+    def __getitem__(self, index):
+        return self.children[index]
+
+    def __setitem__(self, index, value):
+        self.children[index] = value
+
+    def __delitem__(self, index):
+        del self.children[index]
+
+    def get(self, key, default=None):
+        return self.attrib.get(key, default)
+
+    def set(self, key, value):
+        self.attrib[key] = value
+
+    def append(self, child):
+        self.children.append(child)
+
+    def extend(self, children):
+        self.children.extend(children)
+
+    def insert(self, index, child):
+        self.children.insert(index, child)
+
+    def remove(self, child):
+        self.children.remove(child)
+
+    def iter(self, tag=None):
+        """Yield this node and its descendants in document order."""
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if tag is None or node.tag == tag:
+                yield node
+            stack.extend(reversed(node.children))
+
+    def find(self, tag):
+        return next((child for child in self.children if child.tag == tag), None)
+
+    def findall(self, tag):
+        return [child for child in self.children if child.tag == tag]
+
+    def copy(self):
+        """Deep copy, so shared fragments can be placed in several trees."""
+        return Node(self.tag, dict(self.attrib), [c.copy() for c in self.children], self.text)
+
+
+def _attrs(attrs):
+    return {k.rstrip("_").replace("_", "-"): v for k, v in attrs.items() if v is not None}
+
+
+def flatten(items, out=None):
+    """Flatten nested lists of nodes, dropping None."""
+    out = [] if out is None else out
+    for item in items:
+        if isinstance(item, (list, tuple)):
+            flatten(item, out)
+        elif item is not None:
+            out.append(item)
+    return out
+
+
+def el(tag, *children, text=None, **attrs):
+    """Build any element; keyword names map stroke_width -> stroke-width."""
+    return Node(tag, _attrs(attrs), flatten(children), text)
+
+
+def group(*children, **attrs):
+    return el("g", *children, **attrs)
+
+
+def circle(cx, cy, r, **attrs):
+    return Node("circle", {"cx": cx, "cy": cy, "r": r, **_attrs(attrs)})
+
+
+def ellipse(cx, cy, rx, ry, **attrs):
+    return Node("ellipse", {"cx": cx, "cy": cy, "rx": rx, "ry": ry, **_attrs(attrs)})
+
+
+def rect(x, y, width, height, **attrs):
+    return Node("rect", {"x": x, "y": y, "width": width, "height": height, **_attrs(attrs)})
+
+
+def line(x1, y1, x2, y2, **attrs):
+    return Node("line", {"x1": x1, "y1": y1, "x2": x2, "y2": y2, **_attrs(attrs)})
+
+
+def path(d, **attrs):
+    return Node("path", {"d": d, **_attrs(attrs)})
+
+
+def polygon(points, **attrs):
+    return Node("polygon", {"points": points, **_attrs(attrs)})
+
+
+def text(x, y, content, **attrs):
+    return Node("text", {"x": x, "y": y, **_attrs(attrs)}, text=content)
+
+
+def use(href, x=0, y=0, **attrs):
+    return Node("use", {"href": f"#{href}", "x": x, "y": y, **_attrs(attrs)})
+
+
+def fmt_value(value):
+    if isinstance(value, float):
+        return f"{value:g}"
+    return str(value)
+
+
+def escape(value, quote=False):
+    value = value.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+    return value.replace('"', "&quot;") if quote else value
+
+
+def _write(node, out):
+    out.append("<")
+    out.append(node.tag)
+    for key, value in node.attrib.items():
+        out.append(f' {key}="{escape(fmt_value(value), quote=True)}"')
+    if not node.children and not node.text:
+        out.append("/>")
+        return
+    out.append(">")
+    if node.text:
+        out.append(escape(node.text))
+    for child in node.children:
+        _write(child, out)
+    out.append(f"</{node.tag}>")
+
+
+def serialize(node, root=True):
+    """Serialize a tree to markup in one pass; root adds the SVG namespace."""
+    out = []
+    if root and "xmlns" not in node.attrib:
+        node = Node(node.tag, {"xmlns": SVG_NS, **node.attrib}, node.children, node.text)
+    _write(node, out)
+    return "".join(out)
+
+
+def parse(markup):
+    """Parse SVG markup (str or bytes) into Nodes, dropping the namespace."""
+    import xml.etree.ElementTree as ET
+
+    def convert(element):
+        tag = element.tag.rsplit("}", 1)[-1]
+        return Node(tag, dict(element.attrib), [convert(c) for c in element], element.text)
+
+    return convert(ET.fromstring(markup))
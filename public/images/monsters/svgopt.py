@@ -0,0 +1,849 @@
+"""Lossless size optimizer for the token scene trees built by gen_tokens.py."""
+import functools, gzip, hashlib
+import re
+
+from scene import Node, fmt_value, serialize
+
+PRECISION = 2
+# Ids of fragments that are identical wherever they appear (content-derived),
+# so they can be shared across tokens instead of namespaced per token.
+SHARED_PREFIX = "_"
+
+NUMERIC_ATTRS = {
+    "cx", "cy", "r", "rx", "ry", "x", "y", "width", "height", "x1", "y1", "x2", "y2",
+    "stroke-width", "opacity", "fill-opacity", "stroke-opacity", "stop-opacity",
+    "offset", "font-size",
+}
+LIST_ATTRS = {"points", "transform", "viewBox"}
+COLOR_ATTRS = {"fill", "stroke", "color", "stop-color"}
+# Inherited presentation attributes that may be hoisted onto a wrapping <g>.
+# opacity and transform are deliberately absent: on a group they composite
+# or transform the children as a whole, which is not equivalent.
+INHERITED = ("fill", "stroke", "stroke-width", "stroke-linecap", "stroke-linejoin",
+             "fill-opacity", "stroke-opacity")
+# Initial values of the inherited attributes at the root.
+DEFAULTS = {
+    "fill": "#000", "stroke": "none", "stroke-width": "1", "stroke-linecap": "butt",
+    "stroke-linejoin": "miter", "fill-opacity": "1", "stroke-opacity": "1",
+}
+STROKE_ONLY = ("stroke-width", "stroke-linecap", "stroke-linejoin", "stroke-opacity")
+NAMED_COLORS = {"white": "#fff", "black": "#000", "red": "#f00"}
+SHAPES = {"circle", "ellipse", "rect", "path", "polygon", "polyline", "line"}
+
+_NUMBER = re.compile(r"-?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?")
+_PATH_TOKEN = re.compile(r"[A-Za-z]|-?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?")
+
+
+def fmt_num(value, precision=PRECISION):
+    """Format a number with at most `precision` decimals and no redundant zeros."""
+    text = f"{round(float(value), precision):.{precision}f}"
+    if "." in text:
+        text = text.rstrip("0").rstrip(".")
+    if text in ("-0", ""):
+        return "0"
+    if text.startswith("0."):
+        return text[1:]
+    if text.startswith("-0."):
+        return "-" + text[2:]
+    return text
+
+
+def fmt_list(value, precision=PRECISION):
+    return _NUMBER.sub(lambda m: fmt_num(m.group(), precision), value)
+
+
+def fmt_path(d, precision=PRECISION):
+    """Re-emit path data with rounded numbers and only the separators it needs."""
+    out = []
+    prev = ""
+    for tok in _PATH_TOKEN.findall(d):
+        if tok.isalpha():
+            out.append(tok)
+        else:
+            tok = fmt_num(tok, precision)
+            # A separator is only needed between two numbers, and not before
+            # a minus sign or before ".5" following a number that has a dot.
+            if prev and not prev.isalpha() and not (
+                    tok.startswith("-") or (tok.startswith(".") and "." in prev)):
+                out.append(" ")
+            out.append(tok)
+        prev = tok
+    return "".join(out)
+
+
+def fmt_color(value):
+    value = NAMED_COLORS.get(value.lower(), value)
+    if re.fullmatch(r"#[0-9a-fA-F]{6}", value):
+        value = value.lower()
+        if value[1] == value[2] and value[3] == value[4] and value[5] == value[6]:
+            value = "#" + value[1] + value[3] + value[5]
+    return value
+
+
+def prefix_ids(root, prefix):
+    """Namespace every non-shared id under root (and references to it) with prefix."""
+    ids = {el.get("id") for el in root.iter()
+           if el.get("id") and not el.get("id").startswith(SHARED_PREFIX)}
+    if not ids:
+        return
+    url = re.compile(r"url\(#([^)]+)\)")
+    for el in root.iter():
+        for key, value in el.attrib.items():
+            if key == "id" and value in ids:
+                el.set(key, prefix + value)
+            elif key == "href" and value[1:] in ids:
+                el.set(key, "#" + prefix + value[1:])
+            elif "url(#" in value:
+                el.set(key, url.sub(
+                    lambda m: f"url(#{prefix + m.group(1) if m.group(1) in ids else m.group(1)})", value))
+
+
+def _rewrite_attrs(el, precision):
+    for key, value in list(el.attrib.items()):
+        value = fmt_value(value)
+        el.set(key, value)
+        if key == "d":
+            el.set(key, fmt_path(value, precision))
+        elif key in NUMERIC_ATTRS or key in LIST_ATTRS:
+            el.set(key, fmt_list(value, precision))
+        elif key in COLOR_ATTRS:
+            el.set(key, fmt_color(value))
+
+
+def _ellipse_to_circle(el):
+    if el.tag == "ellipse" and el.get("rx") is not None and el.get("rx") == el.get("ry"):
+        attrs = dict(el.attrib)
+        el.attrib.clear()
+        for key in ("cx", "cy"):
+            if key in attrs:
+                el.set(key, attrs.pop(key))
+        el.set("r", attrs.pop("rx"))
+        del attrs["ry"]
+        el.attrib.update(attrs)
+        el.tag = "circle"
+
+
+def _strip_defaults(el, inherited):
+    """Drop attributes that restate the inherited (or initial) value."""
+    if el.get("opacity") == "1":
+        del el.attrib["opacity"]
+    for key in INHERITED:
+        if key in el.attrib and el.get(key) == inherited[key]:
+            del el.attrib[key]
+    if el.tag == "rect":
+        for key in ("x", "y", "rx", "ry"):
+            if el.get(key) == "0":
+                del el.attrib[key]
+    elif el.tag in ("circle", "ellipse"):
+        for key in ("cx", "cy"):
+            if el.get(key) == "0":
+                del el.attrib[key]
+    if el.tag in SHAPES and el.get("stroke", inherited["stroke"]) == "none":
+        for key in STROKE_ONLY:
+            el.attrib.pop(key, None)
+
+
+# Containers whose children are rendered in place; anything else (defs,
+# symbol, gradients) is instantiated elsewhere and inherits from there.
+GROUPS = {"svg", "g"}
+UNKNOWN = dict.fromkeys(INHERITED)
+
+
+def _walk(el, inherited, precision):
+    for child in el:
+        _rewrite_attrs(child, precision)
+        _ellipse_to_circle(child)
+        _strip_defaults(child, inherited)
+        if len(child):
+            if child.tag in GROUPS:
+                scope = dict(inherited)
+                scope.update((k, child.get(k)) for k in INHERITED if k in child.attrib)
+            else:
+                scope = UNKNOWN
+            _walk(child, scope, precision)
+
+
+def _shared(el):
+    return {(k, el.get(k)) for k in INHERITED if k in el.attrib}
+
+
+def _saving(shared, count):
+    """Raw bytes saved by hoisting `shared` out of `count` siblings into one <g>.
+
+    Only picks the runs to group; optimize keeps the pass if it also
+    shrinks the compressed file.
+    """
+    per_attr = sum(len(f' {k}="{v}"') for k, v in shared)
+    return per_attr * (count - 1) - len("<g></g>")
+
+
+def _hoist(parent):
+    """Wrap runs of leaf siblings sharing inherited attributes in a <g>.
+
+    Only consecutive siblings are grouped, so paint order is unchanged.
+    """
+    for child in parent:
+        if child.tag in GROUPS:
+            _hoist(child)
+    children = list(parent)
+    result = []
+    i = 0
+    while i < len(children):
+        common = _shared(children[i]) if len(children[i]) == 0 else set()
+        best_end, best_common, best_saving = i + 1, set(), 0
+        j = i + 1
+        while common and j < len(children) and len(children[j]) == 0:
+            common = common & _shared(children[j])
+            j += 1
+            saving = _saving(common, j - i)
+            if common and saving > best_saving:
+                best_end, best_common, best_saving = j, common, saving
+        if best_common:
+            group = Node("g")
+            for key in INHERITED:
+                value = dict(best_common).get(key)
+                if value is not None:
+                    group.set(key, value)
+            for child in children[i:best_end]:
+                for key in group.attrib:
+                    del child.attrib[key]
+                group.append(child)
+            result.append(group)
+        else:
+            result.extend(children[i:best_end])
+        i = best_end
+    parent[:] = result
+
+
+# Position attributes that <use x y> can stand in for, per instanceable tag.
+ANCHORS = {"rect": ("x", "y"), "circle": ("cx", "cy"), "ellipse": ("cx", "cy")}
+# Per-instance attributes left on the <use>: they inherit into the shared
+# geometry (opacity composites one element either way).
+USE_PARAMS = INHERITED + ("opacity",)
+_PAIR_COMMANDS = set("MLQCST")
+
+
+def _translate_path(d, precision):
+    """Split absolute path data into its start point and a copy moved to 0,0."""
+    tokens = _PATH_TOKEN.findall(d)
+    if not tokens or tokens[0] != "M" or any(
+            t.isalpha() and t not in _PAIR_COMMANDS and t not in "Zz" for t in tokens):
+        return None
+    x0, y0 = float(tokens[1]), float(tokens[2])
+    out = []
+    coord = 0
+    for tok in tokens:
+        if tok.isalpha():
+            out.append(tok)
+            coord = 0
+            continue
+        origin = x0 if coord % 2 == 0 else y0
+        coord += 1
+        out.append(str(float(tok) - origin))
+    return fmt_num(x0, precision), fmt_num(y0, precision), fmt_path(" ".join(out), precision)
+
+
+def _instance(el, precision):
+    """Return (x, y, geometry attrs, use params) for el, or None if it has to stay inline."""
+    if "id" in el.attrib or "transform" in el.attrib or len(el) or el.text:
+        return None
+    geometry = {k: v for k, v in el.attrib.items() if k not in USE_PARAMS}
+    params = {k: v for k, v in el.attrib.items() if k in USE_PARAMS}
+    if el.tag in ANCHORS:
+        xk, yk = ANCHORS[el.tag]
+        x, y = geometry.pop(xk, "0"), geometry.pop(yk, "0")
+    elif el.tag == "path" and "d" in geometry:
+        moved = _translate_path(geometry["d"], precision)
+        if moved is None:
+            return None
+        x, y, geometry["d"] = moved
+    else:
+        return None
+    return x, y, geometry, params
+
+
+def _use_attrs(frag_id, x, y, params):
+    attrs = {"href": f"#{frag_id}"}
+    if x != "0":
+        attrs["x"] = x
+    if y != "0":
+        attrs["y"] = y
+    attrs.update(params)
+    return attrs
+
+
+def _markup_len(tag, attrs):
+    return len(f"<{tag}/>") + sum(len(f' {k}="{v}"') for k, v in attrs.items())
+
+
+def dedup(root, precision=PRECISION):
+    """Replace repeated shapes with <use> references to one shared definition.
+
+    Shapes that differ only in position and inherited paint (fill, stroke,
+    opacity) share a definition in <defs>; each copy becomes a <use> that
+    carries its own position and paint. A shape is only instanced when that
+    makes the file smaller. Definition ids hash their markup, so identical
+    geometry in different tokens gets the same id. Run on a sprite sheet,
+    shapes are matched across all of its symbols.
+    """
+    groups = {}
+    stack = [root]
+    while stack:
+        parent = stack.pop()
+        for el in parent:
+            if el.tag in GROUPS or el.tag == "symbol":
+                stack.append(el)
+                continue
+            inst = _instance(el, precision)
+            if inst is not None:
+                key = (el.tag, tuple(inst[2].items()))
+                groups.setdefault(key, []).append((el, inst))
+    defs = None
+    for (tag, geometry), members in groups.items():
+        if len(members) < 2:
+            continue
+        body = _markup_len(tag, dict(geometry))
+        frag_id = SHARED_PREFIX + tag[0] + hashlib.sha1(
+            f"{tag}{geometry}".encode()).hexdigest()[:6]
+        saving = -(body + len(f' id="{frag_id}"'))
+        for el, (x, y, _, params) in members:
+            saving += _markup_len(el.tag, el.attrib) - _markup_len("use", _use_attrs(frag_id, x, y, params))
+        if saving <= 0:
+            continue
+        if defs is None:
+            defs = root.find("defs")
+            if defs is None:
+                defs = Node("defs")
+                root.insert(0, defs)
+        defs.append(Node(tag, {"id": frag_id, **dict(geometry)}))
+        for el, (x, y, _, params) in members:
+            el.tag = "use"
+            el.attrib.clear()
+            el.attrib.update(_use_attrs(frag_id, x, y, params))
+
+
+def _placed(fragment, ref):
+    """Copies of fragment's shapes drawn where the <use> ref places them."""
+    x, y = float(ref.get("x", 0)), float(ref.get("y", 0))
+    params = {k: v for k, v in ref.attrib.items() if k not in ("href", "x", "y")}
+    shapes = list(fragment) if fragment.tag == "g" else [fragment]
+    if any(s.tag not in ANCHORS or "transform" in s.attrib or len(s) for s in shapes) or any(
+            k not in INHERITED and k != "color" for k in params):
+        # Anything else keeps the <use> semantics: translated, and opacity
+        # compositing the fragment as a whole.
+        placed = [s.copy() for s in shapes]
+        for s in placed:
+            s.attrib.pop("id", None)
+        return [Node("g", {"transform": f"translate({fmt_num(x)} {fmt_num(y)})", **params}, placed)]
+    placed = []
+    for shape in shapes:
+        shape = shape.copy()
+        shape.attrib.pop("id", None)
+        xk, yk = ANCHORS[shape.tag]
+        shape.set(xk, float(shape.get(xk, 0)) + x)
+        shape.set(yk, float(shape.get(yk, 0)) + y)
+        for key in INHERITED:
+            if key in params and key not in shape.attrib:
+                shape.set(key, params[key])
+        for key in ("fill", "stroke"):
+            if shape.get(key) == "currentColor" and "color" in params:
+                shape.set(key, params["color"])
+        placed.append(shape)
+    return placed
+
+
+def inline_fragments(root):
+    """Replace every <use> of a shared fragment with placed copies of it.
+
+    Shared fragments pay off across the symbols of a sprite sheet; in a
+    single file they cost more gzipped than the few shapes they stand
+    for. Circles, ellipses and rects are moved to the <use> position and
+    take its paint; other fragments keep a translated <g>. The inlined
+    fragments are removed from <defs>.
+    """
+    fragments = {n.get("id"): n for d in root.findall("defs") for n in d
+                 if str(n.get("id", "")).startswith(SHARED_PREFIX)}
+    if not fragments:
+        return root
+
+    def place(parent):
+        children = []
+        for child in parent:
+            frag = fragments.get(child.get("href", "")[1:]) if child.tag == "use" else None
+            if frag is not None:
+                children += _placed(frag, child)
+                continue
+            if len(child) and child.tag != "defs":
+                place(child)
+            children.append(child)
+        parent[:] = children
+
+    place(root)
+    for defs in root.findall("defs"):
+        defs[:] = [n for n in defs if n.get("id") not in fragments]
+        if len(defs) == 0:
+            root.remove(defs)
+    return root
+
+
+# Attributes a primitive may carry and still be merged into a compound
+# <path>: they become the path's own, so members must agree on all of them.
+MERGE_STYLE = INHERITED + ("opacity", "transform", "fill-rule", "stroke-miterlimit")
+GEOMETRY = {
+    "circle": ("cx", "cy", "r"), "ellipse": ("cx", "cy", "rx", "ry"),
+    "rect": ("x", "y", "width", "height", "rx", "ry"), "line": ("x1", "y1", "x2", "y2"),
+    "polygon": ("points",), "polyline": ("points",), "path": ("d",),
+}
+# Drawn clockwise by _subpath, so overlapping opaque fills union under nonzero.
+CLOCKWISE = {"circle", "ellipse", "rect"}
+_OPAQUE = re.compile(r"#[0-9a-f]{3}|#[0-9a-f]{6}|none")
+_ARGS = {"M": 2, "L": 2, "H": 1, "V": 1, "C": 6, "S": 4, "Q": 4, "T": 2, "Z": 0}
+
+
+def path_points(d):
+    """Subpaths of path data as lists of absolute end and control points.
+
+    Returns None for arcs or malformed data. Control points bound their
+    Bezier segments, so the points are a conservative outline.
+    """
+    tokens = _PATH_TOKEN.findall(d)
+    subpaths = []
+    x = y = sx = sy = 0.0
+    cmd = None
+    i = 0
+    while i < len(tokens):
+        if tokens[i].isalpha():
+            cmd = tokens[i]
+            i += 1
+            if cmd in "Zz":
+                x, y = sx, sy
+                continue
+        upper = (cmd or "?").upper()
+        if upper not in _ARGS:
+            return None
+        args = tokens[i:i + _ARGS[upper]]
+        if len(args) < _ARGS[upper] or any(t.isalpha() for t in args):
+            return None
+        i += len(args)
+        args = [float(t) for t in args]
+        dx, dy = (x, y) if cmd.islower() else (0.0, 0.0)
+        if upper == "H":
+            points = [(args[0] + dx, y)]
+        elif upper == "V":
+            points = [(x, args[0] + dy)]
+        else:
+            points = [(args[k] + dx, args[k + 1] + dy) for k in range(0, len(args), 2)]
+        if upper == "M":
+            subpaths.append([])
+        elif not subpaths:
+            return None
+        subpaths[-1].extend(points)
+        x, y = points[-1]
+        if upper == "M":
+            sx, sy = x, y
+            cmd = "l" if cmd == "m" else "L"
+    return subpaths
+
+
+def _path_bbox(d):
+    """Bounds of every end and control point of path data, or None for arcs."""
+    subpaths = path_points(d)
+    points = [p for sub in subpaths or [] for p in sub]
+    if not points:
+        return None
+    xs, ys = [p[0] for p in points], [p[1] for p in points]
+    return min(xs), min(ys), max(xs), max(ys)
+
+
+def _bbox(el, scope):
+    """Painted bounds of a leaf shape in its parent's coordinates, or None if unknown."""
+    try:
+        g = {k: float(el.get(k, 0)) for k in GEOMETRY[el.tag] if k not in ("points", "d")}
+        if el.tag == "circle":
+            box = (g["cx"] - g["r"], g["cy"] - g["r"], g["cx"] + g["r"], g["cy"] + g["r"])
+        elif el.tag == "ellipse":
+            box = (g["cx"] - g["rx"], g["cy"] - g["ry"], g["cx"] + g["rx"], g["cy"] + g["ry"])
+        elif el.tag == "rect":
+            box = (g["x"], g["y"], g["x"] + g["width"], g["y"] + g["height"])
+        elif el.tag == "line":
+            box = (min(g["x1"], g["x2"]), min(g["y1"], g["y2"]),
+                   max(g["x1"], g["x2"]), max(g["y1"], g["y2"]))
+        elif el.tag == "path":
+            box = _path_bbox(el.get("d"))
+        else:
+            numbers = [float(n) for n in _NUMBER.findall(el.get("points"))]
+            box = (min(numbers[0::2]), min(numbers[1::2]), max(numbers[0::2]), max(numbers[1::2]))
+        pad = 1.0  # anti-aliasing bleeds into the next pixel
+        if el.get("stroke", scope["stroke"]) != "none":
+            # A miter can reach miterlimit (4) half-widths from the outline.
+            pad += 2 * float(el.get("stroke-width", scope["stroke-width"]))
+    except (KeyError, TypeError, ValueError, IndexError):
+        return None
+    if box is None or "transform" in el.attrib:
+        return None
+    return (box[0] - pad, box[1] - pad, box[2] + pad, box[3] + pad)
+
+
+def _disjoint(a, b):
+    return a is not None and b is not None and (
+        a[2] <= b[0] or b[2] <= a[0] or a[3] <= b[1] or b[3] <= a[1])
+
+
+def _subpath(el):
+    """Path data drawing el on its own, or None if it cannot be expressed."""
+    a = el.attrib
+    try:
+        if el.tag in ("circle", "ellipse"):
+            rx = float(a["r"] if el.tag == "circle" else a["rx"])
+            ry = float(a["r"] if el.tag == "circle" else a["ry"])
+            cx, cy = float(a.get("cx", 0)), float(a.get("cy", 0))
+            if rx <= 0 or ry <= 0:
+                return None
+            return (f"M{cx - rx} {cy}a{rx} {ry} 0 1 1 {2 * rx} 0"
+                    f"a{rx} {ry} 0 1 1 {-2 * rx} 0z")
+        if el.tag == "rect":
+            x, y = float(a.get("x", 0)), float(a.get("y", 0))
+            w, h = float(a["width"]), float(a["height"])
+            if w <= 0 or h <= 0:
+                return None
+            # A missing corner radius takes the other one; both are clamped.
+            rx, ry = a.get("rx", a.get("ry", 0)), a.get("ry", a.get("rx", 0))
+            rx, ry = min(float(rx), w / 2), min(float(ry), h / 2)
+            if rx <= 0 or ry <= 0:
+                return f"M{x} {y}h{w}v{h}h{-w}z"
+            corner = f"a{rx} {ry} 0 0 1"
+            return (f"M{x + rx} {y}h{w - 2 * rx}{corner} {rx} {ry}v{h - 2 * ry}"
+                    f"{corner} {-rx} {ry}h{2 * rx - w}{corner} {-rx} {-ry}"
+                    f"v{2 * ry - h}{corner} {rx} {-ry}z")
+        if el.tag == "line":
+            return f"M{a.get('x1', 0)} {a.get('y1', 0)}L{a.get('x2', 0)} {a.get('y2', 0)}"
+        if el.tag in ("polygon", "polyline"):
+            numbers = _NUMBER.findall(a["points"])
+            if len(numbers) < 4 or len(numbers) % 2:
+                return None
+            return "M" + " ".join(numbers) + ("z" if el.tag == "polygon" else "")
+        tokens = _PATH_TOKEN.findall(a["d"])
+    except (KeyError, ValueError):
+        return None
+    if not tokens or tokens[0] not in "Mm" or any(t in "Aa" for t in tokens):
+        return None
+    if tokens[0] == "m":
+        # A leading m is absolute only at the start of the whole path, and
+        # its implicit pairs are relative lines.
+        tokens[0] = "M"
+        if len(tokens) > 3 and not tokens[3].isalpha():
+            tokens.insert(3, "l")
+    return " ".join(tokens)
+
+
+def _merge_info(el, scope):
+    """(style key, bbox, overlap-safe) for a mergeable shape, else None."""
+    if (el.tag not in GEOMETRY or len(el) or el.text
+            or any(k not in MERGE_STYLE and k not in GEOMETRY[el.tag] for k in el.attrib)):
+        return None
+    paint = {k: el.get(k, scope[k]) for k in INHERITED}
+    if "url(" in paint["fill"] + paint["stroke"]:
+        return None  # gradient bounding boxes would change
+    if _subpath(el) is None:
+        return None
+    opaque = (el.get("opacity", "1") == "1" and paint["fill-opacity"] == "1"
+              and paint["stroke-opacity"] == "1"
+              and all(_OPAQUE.fullmatch(paint[k]) for k in ("fill", "stroke")))
+    stroked, filled = paint["stroke"] != "none", paint["fill"] != "none"
+    nonzero = el.get("fill-rule", scope["fill-rule"]) != "evenodd"
+    # A compound path fills everything, then strokes everything, with one
+    # winding rule and one compositing pass, so overlapping members are
+    # only equivalent when opaque and either stroke-only or clockwise fills.
+    overlap = opaque and (not filled or (not stroked and nonzero and el.tag in CLOCKWISE))
+    key = tuple((k, el.get(k)) for k in MERGE_STYLE if k in el.attrib)
+    return key, _bbox(el, scope), overlap
+
+
+def _merge_children(parent, scope, precision):
+    removed = 0
+    for child in parent:
+        if child.tag in GROUPS and len(child):
+            inner = dict(scope)
+            inner.update((k, child.get(k)) for k in (*INHERITED, "fill-rule") if k in child.attrib)
+            removed += _merge_children(child, inner, precision)
+    children = list(parent)
+    info = [_merge_info(child, scope) for child in children]
+    boxes = [i[1] if i else _bbox(c, scope) if c.tag in GEOMETRY else None
+             for c, i in zip(children, info)]
+    taken = set()
+    result = []
+    for i, child in enumerate(children):
+        if i in taken:
+            continue
+        members = [i]
+        if info[i]:
+            key = info[i][0]
+            for j in range(i + 1, len(children)):
+                if j in taken or not info[j] or info[j][0] != key:
+                    continue
+                # j moves back to i's slot: it must clear every shape it
+                # jumps over, and the members it joins unless overlap is safe.
+                between = [k for k in range(i + 1, j) if k not in taken and k not in members]
+                if all(_disjoint(boxes[j], boxes[k]) for k in between) and all(
+                        (info[j][2] and info[k][2]) or _disjoint(boxes[j], boxes[k])
+                        for k in members):
+                    members.append(j)
+        if len(members) == 1:
+            result.append(child)
+            continue
+        d = fmt_path(" ".join(_subpath(children[k]) for k in members), precision)
+        merged = Node("path", {"d": d, **dict(info[i][0])})
+        if len(serialize(merged, root=False)) >= sum(
+                len(serialize(children[k], root=False)) for k in members):
+            result.append(child)
+            continue
+        taken.update(members)
+        result.append(merged)
+        removed += len(members) - 1
+    parent[:] = result
+    return removed
+
+
+def merge_paths(root, precision=PRECISION):
+    """Merge same-style primitives into one compound <path>; return nodes removed.
+
+    Shapes whose fill, stroke, opacity and transform all match become
+    subpaths of a single path drawn where the first of them was. A later
+    shape only joins when it does not overlap anything it would now be
+    painted under, so paint order is preserved, and members may only
+    overlap each other where the union renders identically. A merge is
+    only made when the compound path is shorter than its members.
+    """
+    return _merge_children(root, dict(DEFAULTS, **{"fill-rule": "nonzero"}), precision)
+
+
+def _rgb(color):
+    """(r, g, b) of a solid hex or named colour, else None."""
+    color = fmt_color(color)
+    if not _OPAQUE.fullmatch(color) or color == "none":
+        return None
+    digits = color[1:] if len(color) == 7 else "".join(c * 2 for c in color[1:])
+    return tuple(int(digits[i:i + 2], 16) for i in (0, 2, 4))
+
+
+def _blend(color, backdrop, alpha):
+    return fmt_color("#%02x%02x%02x" % tuple(
+        round(b + (c - b) * alpha) for c, b in zip(color, backdrop)))
+
+
+def _contains(el, x, y):
+    """Whether the point lies inside a circle, ellipse or (rounded) rect."""
+    a = {k: float(el.get(k, 0)) for k in GEOMETRY[el.tag]}
+    if el.tag in ("circle", "ellipse"):
+        rx = a["r"] if el.tag == "circle" else a["rx"]
+        ry = a["r"] if el.tag == "circle" else a["ry"]
+        return ((x - a["cx"]) / rx) ** 2 + ((y - a["cy"]) / ry) ** 2 <= 1
+    x0, y0, x1, y1 = a["x"], a["y"], a["x"] + a["width"], a["y"] + a["height"]
+    if not (x0 <= x <= x1 and y0 <= y <= y1):
+        return False
+    rx, ry = el.get("rx", el.get("ry", 0)), el.get("ry", el.get("rx", 0))
+    rx, ry = min(float(rx), a["width"] / 2), min(float(ry), a["height"] / 2)
+    if rx <= 0 or ry <= 0:
+        return True
+    cx = min(max(x, x0 + rx), x1 - rx)
+    cy = min(max(y, y0 + ry), y1 - ry)
+    return ((x - cx) / rx) ** 2 + ((y - cy) / ry) ** 2 <= 1
+
+
+def _paint_order(parent, scope, isolated, out):
+    """Append (element, scope, isolated) for every painted leaf, bottom first.
+
+    isolated leaves sit in a group with its own opacity, transform or
+    effects, so neither their colour nor their position is final.
+    """
+    for child in parent:
+        if child.tag == "defs":
+            continue
+        if child.tag in GROUPS:
+            inner = dict(scope)
+            inner.update((k, child.get(k)) for k in (*INHERITED, "fill-rule") if k in child.attrib)
+            _paint_order(child, inner, isolated or any(
+                k not in MERGE_STYLE or k in ("opacity", "transform") for k in child.attrib), out)
+        else:
+            out.append((child, scope, isolated))
+    return out
+
+
+def _use_bbox(el, scope, fragments):
+    """Bounds of a <use> from the fragment it places, or None."""
+    ref = fragments.get(el.get("href", "")[1:])
+    if ref is None or "transform" in el.attrib:
+        return None
+    inner = dict(scope)
+    inner.update((k, el.get(k)) for k in INHERITED if k in el.attrib)
+    shapes = list(ref) if ref.tag == "g" else [ref]
+    boxes = [_bbox(s, inner) if s.tag in GEOMETRY else None for s in shapes]
+    if not boxes or None in boxes:
+        return None
+    dx, dy = float(el.get("x", 0)), float(el.get("y", 0))
+    return (min(b[0] for b in boxes) + dx, min(b[1] for b in boxes) + dy,
+            max(b[2] for b in boxes) + dx, max(b[3] for b in boxes) + dy)
+
+
+def _translucent(el, scope):
+    return any(float(el.get(k, scope.get(k, "1"))) < 1
+               for k in ("opacity", "fill-opacity", "stroke-opacity"))
+
+
+def _flatten_one(i, entries, boxes):
+    """Bake entry i over its backdrop; return None or why it cannot be done."""
+    el, scope, isolated = entries[i]
+    if isolated:
+        return "inside a group with its own opacity or transform"
+    if el.tag not in GEOMETRY or any(k not in MERGE_STYLE and k not in GEOMETRY[el.tag]
+                                     for k in el.attrib):
+        return "not a plain shape"
+    paint = {k: el.get(k, scope[k]) for k in INHERITED}
+    fill, stroke = _rgb(paint["fill"]), _rgb(paint["stroke"])
+    if (fill is None and paint["fill"] != "none") or (stroke is None and paint["stroke"] != "none"):
+        return "paint is not a solid colour"
+    opacity = float(el.get("opacity", "1"))
+    fill_alpha, stroke_alpha = float(paint["fill-opacity"]), float(paint["stroke-opacity"])
+    if fill and stroke and (fill_alpha < 1 or stroke_alpha < 1):
+        # The stroke would composite over a translucent fill, not the backdrop.
+        return "stroke is drawn over a translucent fill"
+    box = boxes[i]
+    if box is None:
+        return "bounds unknown"
+    # The topmost earlier shape touching this one is its whole backdrop
+    # only if it covers every pixel this one touches.
+    j = next((j for j in range(i - 1, -1, -1) if not _disjoint(box, boxes[j])), None)
+    if j is None:
+        return "nothing underneath"
+    under, under_scope, under_isolated = entries[j]
+    backdrop = _rgb(under.get("fill", under_scope["fill"])) if under.tag in GEOMETRY else None
+    if (backdrop is None or under_isolated or _translucent(under, under_scope)
+            or under.get("stroke", under_scope["stroke"]) != "none"):
+        return "backdrop is not one opaque solid colour"
+    if under.tag not in CLOCKWISE or boxes[j] is None:
+        return f"backdrop is a {under.tag}"
+    if not all(_contains(under, x, y) for x in (box[0], box[2]) for y in (box[1], box[3])):
+        return "extends past the edge of its backdrop"
+    # Coverage is linear in colour, so anti-aliased edges blend to the same
+    # result over a single backdrop colour too.
+    if fill:
+        el.set("fill", _blend(fill, backdrop, opacity * fill_alpha))
+    if stroke:
+        el.set("stroke", _blend(stroke, backdrop, opacity * stroke_alpha))
+    for key in ("opacity", "fill-opacity", "stroke-opacity"):
+        el.attrib.pop(key, None)
+    if paint["fill-opacity"] != "1":
+        el.set("fill-opacity", "1")
+    if paint["stroke-opacity"] != "1":
+        el.set("stroke-opacity", "1")
+    return None
+
+
+def flatten_opacity(root):
+    """Bake translucent shapes over a single solid backdrop into opaque colours.
+
+    A translucent shape whose every painted pixel lies inside one opaque,
+    solid-filled circle, ellipse or rect, with nothing else in between,
+    gets the pre-blended colour instead of its opacity. Returns
+    (markup, reason) for every translucent shape left as it was.
+    """
+    entries = _paint_order(root, dict(DEFAULTS, **{"fill-rule": "nonzero"}), False, [])
+    fragments = {n.get("id"): n for d in root.iter("defs") for n in d if n.get("id")}
+    boxes = [None if isolated else _use_bbox(el, scope, fragments) if el.tag == "use"
+             else _bbox(el, scope) if el.tag in GEOMETRY else None
+             for el, scope, isolated in entries]
+    kept = []
+    for i, (el, scope, _) in enumerate(entries):
+        if _translucent(el, scope):
+            reason = _flatten_one(i, entries, boxes)
+            if reason:
+                kept.append((serialize(el, root=False), reason))
+    for frag in fragments.values():
+        for el in frag.iter():
+            if el is not frag or frag.tag != "g":
+                if el.tag in GEOMETRY and float(el.get("opacity", "1")) < 1:
+                    kept.append((serialize(el, root=False), "in a fragment placed over several backdrops"))
+    return kept
+
+
+def _collapse_defs(root):
+    """Move the id of a bare single-child <g> in <defs> onto the child."""
+    for defs in root.iter("defs"):
+        for i, el in enumerate(list(defs)):
+            if (el.tag == "g" and list(el.attrib) == ["id"] and len(el) == 1
+                    and "id" not in el[0].attrib):
+                child = el[0]
+                attrs = {"id": el.get("id"), **child.attrib}
+                child.attrib.clear()
+                child.attrib.update(attrs)
+                defs[i] = child
+
+
+@functools.lru_cache(maxsize=64)
+def served_size(data, encoding):
+    """Bytes data takes over the wire as gz or br, as gen_tokens precompresses it.
+
+    None for br when the brotli package is not installed.
+    """
+    if encoding == "gz":
+        return len(gzip.compress(data, compresslevel=9, mtime=0))
+    try:
+        import brotli
+    except ImportError:
+        return None
+    return len(brotli.compress(data, mode=brotli.MODE_TEXT, quality=11))
+
+
+def _grows(before, after):
+    """Whether after is served larger than before, gzip or brotli.
+
+    Brotli is the slow one, so it is only asked when gzip did not grow.
+    """
+    if after == before:
+        return False
+    if served_size(after, "gz") > served_size(before, "gz"):
+        return True
+    br = served_size(after, "br")
+    return br is not None and br > served_size(before, "br")
+
+
+def _guarded(root, size_pass, *args):
+    """Run size_pass on root and undo it if the file would be served larger.
+
+    Repeated markup compresses well, so a pass that saves raw bytes can
+    still cost bytes on the wire; that size is the one that counts.
+    """
+    before = serialize(root).encode()
+    saved = root.copy()
+    size_pass(root, *args)
+    if _grows(before, serialize(root).encode()):
+        root.attrib, root.children = saved.attrib, saved.children
+
+
+def optimize(root, precision=PRECISION, merge=True, flatten=True, report=None):
+    """Rewrite a scene tree in place into a minimal equivalent and return it.
+
+    Rounds numbers, shortens colors and path data, turns equal-radius
+    ellipses into circles, strips attributes that restate defaults,
+    bakes translucent shapes over one solid colour into opaque ones
+    (unless flatten is false), merges same-style shapes into compound
+    paths (unless merge is false), instances repeated shapes through
+    <use> and hoists attributes shared by consecutive siblings into <g>
+    groups. Every pass but flattening, which is there to save the
+    browser compositing work, is dropped for a tree it would make larger
+    gzipped or brotli-compressed. If report is a list, the translucent
+    shapes that could not be flattened are appended to it as (markup,
+    reason) pairs.
+    """
+    _guarded(root, _rewrite_attrs, precision)
+    _guarded(root, _walk, DEFAULTS, precision)
+    _guarded(root, _collapse_defs)
+    if flatten:
+        kept = flatten_opacity(root)
+        if report is not None:
+            report.extend(kept)
+    if merge:
+        _guarded(root, merge_paths, precision)
+    _guarded(root, dedup, precision)
+    _guarded(root, _hoist)
+    return root
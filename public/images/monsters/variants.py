@@ -0,0 +1,211 @@
+"""Stream palette-swapped, tinted, re-ringed and numbered token variants.
+
+A base token is built and optimized once, then compiled into a template:
+its markup split into literal chunks around every colour and around a
+badge slot. A variant only resolves its colours and joins the chunks, so
+it never re-runs the builder or the optimizer.
+
+    python3 variants.py kobold --badges 1-8
+    python3 variants.py wolf --name frost --tint "#9fd3ff"
+    python3 variants.py orc --name chieftain --ring "#d4af37" --map "#7a9c42=#4f6b2a"
+    python3 variants.py --spec variants.json
+
+A spec file is a JSON list of objects with the same keys as the options:
+slug, name, map (old -> new colour object), tint, amount, ring, badges.
+"""
+import argparse, collections, functools, json, pathlib, re, sys, time
+
+import gen_tokens, output, scene, svgopt
+
+OUT = gen_tokens.OUT / "variants"
+TINT_AMOUNT = 0.35
+SLOT = "\x00"  # never produced by the serializer, so safe to split on
+_HEX = re.compile(r"#([0-9a-f]{3}|[0-9a-f]{6})")
+
+Variant = collections.namedtuple(
+    "Variant", "name palette tint amount ring badge",
+    defaults=((), None, TINT_AMOUNT, None, None))
+
+
+def parse_color(value):
+    """Return (r, g, b) for a hex or named colour, else None (none, url(...))."""
+    value = svgopt.fmt_color(value.strip().lower())
+    if not _HEX.fullmatch(value):
+        return None
+    digits = value[1:]
+    if len(digits) == 3:
+        digits = "".join(c * 2 for c in digits)
+    return tuple(int(digits[i:i + 2], 16) for i in (0, 2, 4))
+
+
+def fmt_rgb(rgb):
+    r, g, b = (round(c) for c in rgb)
+    if r % 17 == g % 17 == b % 17 == 0:
+        return "#%x%x%x" % (r // 17, g // 17, b // 17)
+    return "#%02x%02x%02x" % (r, g, b)
+
+
+@functools.lru_cache(maxsize=1024)
+def badge_markup(number):
+    """A numbered disc in the token's lower-right corner."""
+    label = str(number)
+    size = 26 if len(label) < 3 else 20
+    return scene.serialize(scene.group(
+        scene.circle(160, 160, 24, fill="#111", stroke="#fff", stroke_width=3),
+        scene.text(160, 160 + size * 0.35, label, fill="#fff", font_size=size,
+                   font_weight="bold", font_family="sans-serif", text_anchor="middle"),
+    ), root=False)
+
+
+class Template:
+    """A compiled token: literal markup chunks with colour and badge slots.
+
+    chunks has one more entry than slots plus the badge; slots holds the
+    base (r, g, b) of each colour slot in document order, and ring the
+    index of the frame circle's fill so it can be recoloured on its own.
+    The badge slot is always the last one. Recoloured slot values are
+    cached per (palette, tint, amount), so a run of numbered copies of
+    one recolour only pays for it once.
+    """
+    __slots__ = ("slug", "chunks", "slots", "ring", "colors", "recolored")
+
+    def __init__(self, slug, root):
+        self.slug = slug
+        self.slots = []
+        self.ring = None
+        frame = next((n for n in root if n.tag == "circle" and str(n.get("r")) == "100"), None)
+        for node in root.iter():
+            for key, value in list(node.attrib.items()):
+                rgb = parse_color(str(value)) if key in svgopt.COLOR_ATTRS else None
+                if rgb is None:
+                    continue
+                if node is frame and key == "fill":
+                    self.ring = len(self.slots)
+                node.set(key, f"{SLOT}{len(self.slots)}{SLOT}")
+                self.slots.append(rgb)
+        root.append(scene.Node("badge"))
+        markup = scene.serialize(root).replace("<badge/>", SLOT + "badge" + SLOT)
+        # Split yields literal, slot, literal, slot, ...: keep the literals.
+        self.chunks = markup.split(SLOT)[::2]
+        self.colors = sorted(set(self.slots))
+        self.recolored = {((), None, TINT_AMOUNT): [fmt_rgb(rgb) for rgb in self.slots]}
+
+    @classmethod
+    def compile(cls, slug, optimize=True):
+        root = svgopt.inline_fragments(gen_tokens.MONSTERS[slug]())
+        if optimize:
+            # Flattened overlays are pre-blended with the base palette and
+            # would not follow a recolour of their backdrop.
+            svgopt.optimize(root, flatten=False)
+        return cls(slug, root)
+
+    def recolor(self, palette, tint, amount):
+        """Slot values after applying a palette remap, then a tint."""
+        palette = {parse_color(src): parse_color(dst) for src, dst in palette}
+        tint = parse_color(tint) if tint else None
+        resolved = {}
+        for rgb in self.colors:
+            out = palette.get(rgb, rgb)
+            if tint:
+                out = [c + (t - c) * amount for c, t in zip(out, tint)]
+            resolved[rgb] = fmt_rgb(out)
+        return [resolved[rgb] for rgb in self.slots]
+
+    def render(self, variant):
+        """Fill the slots for one variant and return its SVG markup."""
+        key = (variant.palette, variant.tint, variant.amount if variant.tint else TINT_AMOUNT)
+        values = self.recolored.get(key)
+        if values is None:
+            values = self.recolored[key] = self.recolor(*key)
+        values = list(values)
+        if variant.ring and self.ring is not None:
+            values[self.ring] = svgopt.fmt_color(variant.ring)
+        values.append(badge_markup(variant.badge) if variant.badge is not None else "")
+        chunks = self.chunks
+        parts = [chunks[0]]
+        for value, chunk in zip(values, chunks[1:]):
+            parts.append(value)
+            parts.append(chunk)
+        return "".join(parts)
+
+
+def expand(spec):
+    """Turn one spec entry into Variants; badges fan out one per number."""
+    palette = tuple(spec.get("map", {}).items())
+    base = spec.get("name", "")
+    badges = spec.get("badges")
+    if isinstance(badges, str):
+        lo, _, hi = badges.partition("-")
+        badges = range(int(lo), int(hi or lo) + 1)
+    for badge in badges or [None]:
+        name = "-".join(str(p) for p in (base, badge) if p not in ("", None)) or "variant"
+        yield Variant(name, palette, spec.get("tint"), spec.get("amount", TINT_AMOUNT),
+                      spec.get("ring"), badge)
+
+
+def render_all(specs, optimize=True):
+    """Yield (file name, SVG bytes) for every variant, compiling each slug once."""
+    templates = {}
+    for spec in specs:
+        slug = spec["slug"]
+        if slug not in templates:
+            templates[slug] = Template.compile(slug, optimize)
+        template = templates[slug]
+        for variant in expand(spec):
+            yield f"{slug}-{variant.name}.svg", template.render(variant).encode()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("slug", nargs="?", help="base token to derive variants from")
+    parser.add_argument("--spec", type=pathlib.Path, help="JSON list of variant specs")
+    parser.add_argument("--name", default="", help="variant name, appended to the slug")
+    parser.add_argument("--map", action="append", default=[], metavar="OLD=NEW",
+                        help="replace one colour (repeatable)")
+    parser.add_argument("--tint", help="blend every colour toward this one")
+    parser.add_argument("--amount", type=float, default=TINT_AMOUNT,
+                        help="tint strength from 0 to 1 (default: %(default)s)")
+    parser.add_argument("--ring", help="colour of the token's outer ring")
+    parser.add_argument("--badges", metavar="N[-M]", help="numbered badges, one variant each")
+    parser.add_argument("--out", type=pathlib.Path, default=OUT,
+                        help="output directory (default: %(default)s)")
+    parser.add_argument("--no-optimize", dest="optimize", action="store_false")
+    args = parser.parse_args(argv)
+    if args.spec:
+        args.specs = json.loads(args.spec.read_text())
+    elif args.slug:
+        try:
+            palette = dict(pair.split("=", 1) for pair in args.map)
+        except ValueError:
+            parser.error("--map expects OLD=NEW colour pairs")
+        args.specs = [{"slug": args.slug, "name": args.name, "map": palette, "tint": args.tint,
+                       "amount": args.amount, "ring": args.ring, "badges": args.badges}]
+    else:
+        parser.error("give a slug or --spec")
+    unknown = sorted({s["slug"] for s in args.specs} - gen_tokens.MONSTERS.keys())
+    if unknown:
+        parser.error(f"unknown slug(s): {', '.join(unknown)}")
+    colors = [c for s in args.specs for c in (*s.get("map", {}).keys(), *s.get("map", {}).values(),
+                                               s.get("tint"), s.get("ring")) if c]
+    bad = [c for c in colors if parse_color(c) is None]
+    if bad:
+        parser.error(f"not a hex or named colour: {', '.join(bad)}")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    start = time.perf_counter()
+    written = 0
+    with output.DirectoryWriter(args.out) as writer:
+        for name, data in render_all(args.specs, args.optimize):
+            if writer.write(name, data):
+                written += 1
+                print(f"  wrote {name}")
+    print(f"\nDone: {written} written in {(time.perf_counter() - start) * 1000:.0f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
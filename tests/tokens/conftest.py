@@ -0,0 +1,5 @@
+"""Put the token generator (public/images/monsters) on the import path."""
+import pathlib, sys
+
+GENERATOR = pathlib.Path(__file__).resolve().parents[2] / "public" / "images" / "monsters"
+sys.path.insert(0, str(GENERATOR))
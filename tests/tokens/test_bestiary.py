@@ -0,0 +1,31 @@
+import bestiary, output
+
+RECORDS = [{"id": "mon-acolyte", "name": "Acolyte", "type": "humanoid"},
+           {"id": "mon-cave-toad", "name": "Cave Toad", "type": "beast"}]
+
+
+def run(out, drawn=(), dry_run=False):
+    with output.DirectoryWriter(out, durable=False) as writer:
+        return bestiary.run(RECORDS, bestiary.load_styles(), writer, drawn=drawn, dry_run=dry_run)
+
+
+def test_dry_run_counts_what_would_be_written(tmp_path):
+    counts, index = run(tmp_path, dry_run=True)
+    assert (counts["written"], counts["unchanged"]) == (2, 0)
+    assert sorted(index) == ["mon-acolyte", "mon-cave-toad"]
+    assert list(tmp_path.iterdir()) == []
+    run(tmp_path)
+    counts, _ = run(tmp_path, dry_run=True)
+    assert (counts["written"], counts["unchanged"]) == (0, 2)
+
+
+def test_hand_drawn_art_replaces_the_generated_token(tmp_path):
+    run(tmp_path)
+    (tmp_path / "acolyte.svg").write_text("<svg/>")
+    drawn = bestiary.hand_drawn(tmp_path)
+    counts, _ = run(tmp_path, drawn, dry_run=True)
+    assert counts["deleted"] == 1 and (tmp_path / "srd" / "acolyte.svg").exists()
+    counts, index = run(tmp_path, drawn)
+    assert (counts["deleted"], counts["unchanged"]) == (1, 1)
+    assert not (tmp_path / "srd" / "acolyte.svg").exists()
+    assert index["mon-acolyte"] == "acolyte.svg"
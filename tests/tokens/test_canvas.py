@@ -0,0 +1,66 @@
+import json
+
+import canvas, gen_tokens, svgopt
+from scene import circle, el, ellipse, group, path, rect, use
+
+SLUGS = ["kobold", "ogre", "wolf"]
+
+
+def test_commands_resolve_groups_uses_and_transforms():
+    root = el("svg",
+        el("defs", group(circle(0, 0, 2), rect(-1, -1, 2, 2, fill="currentColor"), id="_e")),
+        group(circle(10, 10, 5), rect(0, 0, 4, 4, opacity=0.5),
+              fill="#0f0", stroke="#123", stroke_width=2, transform="translate(5 5)"),
+        ellipse(50, 50, 10, 5, fill="#abc", transform="rotate(90 50 50)"),
+        use("_e", 30, 40, fill="#f00", color="#00f", opacity=0.5),
+        path("M0 0L10 10", stroke="#fff", fill="none", stroke_linecap="round"),
+        viewBox="0 0 100 100")
+    assert canvas.commands(root) == [
+        [{"fill": "#0f0", "stroke": "#123", "lineWidth": 2}, "circle", 15, 15, 5],
+        [{"fill": "#0f0", "stroke": "#123", "lineWidth": 2, "alpha": 0.5}, "rect", 5, 5, 4, 4],
+        [{"fill": "#abc", "transform": [0, 1, -1, 0, 100, 0]}, "ellipse", 50, 50, 10, 5],
+        [{"fill": "#f00", "alpha": 0.5}, "circle", 30, 40, 2],
+        [{"fill": "#00f", "alpha": 0.5}, "rect", 29, 39, 2, 2],
+        [{"stroke": "#fff", "lineWidth": 1, "lineCap": "round"}, "path", "M0 0L10 10"],
+    ]
+    assert canvas.view_box(root) == [0, 0, 100, 100]
+
+
+def test_bundle_shares_styles_by_index():
+    red, blue = {"fill": "#f00"}, {"fill": "#00f"}
+    tokens = {"a": {"viewBox": [0, 0, 10, 10], "commands": [[red, "circle", 1, 1, 1], [blue, "circle", 2, 2, 1]]},
+              "b": {"viewBox": [0, 0, 10, 10], "commands": [[dict(blue), "rect", 0, 0, 1, 1]]}}
+    assert canvas.bundle(tokens) == {
+        "version": canvas.VERSION,
+        "styles": [red, blue],
+        "tokens": {"a": {"viewBox": [0, 0, 10, 10], "commands": [[0, "circle", 1, 1, 1], [1, "circle", 2, 2, 1]]},
+                   "b": {"viewBox": [0, 0, 10, 10], "commands": [[1, "rect", 0, 0, 1, 1]]}},
+    }
+
+
+def paints(commands):
+    return {json.dumps([style.get("fill"), style.get("stroke")], sort_keys=True) for style, *_ in commands}
+
+
+def test_optimizing_keeps_the_painted_colours():
+    for slug, build in gen_tokens.MONSTERS.items():
+        root = build()
+        svgopt.inline_fragments(root)
+        before = canvas.commands(root)
+        after = canvas.commands(svgopt.optimize(root, flatten=False))
+        assert after, slug
+        assert paints(after) <= paints(before), slug
+
+
+def test_canvas_file_lists_every_built_token(tmp_path):
+    argv = ["--out", str(tmp_path), "--only", ",".join(SLUGS), "--no-sprite"]
+    gen_tokens.main([*argv, "--canvas"])
+    document = json.loads((tmp_path / gen_tokens.CANVAS_FILE).read_text())
+    assert sorted(document["tokens"]) == SLUGS
+    for token in document["tokens"].values():
+        assert token["viewBox"] == [0, 0, 200, 200]
+        assert all(0 <= command[0] < len(document["styles"]) for command in token["commands"])
+    gen_tokens.main(argv)
+    assert (tmp_path / gen_tokens.CANVAS_FILE).exists()
+    gen_tokens.main([*argv, "--no-canvas"])
+    assert not (tmp_path / gen_tokens.CANVAS_FILE).exists()
@@ -0,0 +1,184 @@
+import json, zipfile
+
+import pytest
+
+import gen_tokens, output
+
+SLUGS = ["kobold", "ogre", "wolf"]
+
+
+def build(out, slugs=SLUGS, **options):
+    opts = gen_tokens.BuildOptions(sprite=False, **options)
+    with output.DirectoryWriter(out, durable=False) as writer:
+        counts, failed, _, records = gen_tokens.write_tokens(slugs, writer, opts)
+    assert failed == []
+    return counts, records
+
+
+def state(out):
+    return json.loads((out / gen_tokens.STATE_FILE).read_text())
+
+
+def test_second_build_skips_unchanged_tokens(tmp_path):
+    counts, _ = build(tmp_path)
+    assert (counts["written"], counts["skipped"]) == (3, 0)
+    before = {p.name: p.stat().st_mtime_ns for p in tmp_path.glob("*.svg")}
+    counts, _ = build(tmp_path)
+    assert (counts["written"], counts["skipped"], counts["stale"]) == (0, 3, 0)
+    assert {p.name: p.stat().st_mtime_ns for p in tmp_path.glob("*.svg")} == before
+    assert sorted(state(tmp_path)["tokens"]) == SLUGS
+
+
+def test_missing_output_is_rewritten(tmp_path):
+    build(tmp_path)
+    (tmp_path / "wolf.svg").unlink()
+    counts, _ = build(tmp_path)
+    assert (counts["written"], counts["skipped"]) == (1, 2)
+    assert (tmp_path / "wolf.svg").exists()
+
+
+def test_force_rewrites_every_token(tmp_path):
+    build(tmp_path)
+    counts, _ = build(tmp_path, force=True)
+    assert counts["written"] == 3
+
+
+def test_state_from_another_version_is_ignored(tmp_path):
+    build(tmp_path)
+    data = state(tmp_path)
+    data["version"] = gen_tokens.STATE_VERSION - 1
+    data["tokens"]["wolf"]["svg"] = "0" * 64
+    (tmp_path / gen_tokens.STATE_FILE).write_text(json.dumps(data))
+    assert gen_tokens.load_state(tmp_path) == {}
+    counts, _ = build(tmp_path)
+    assert counts["written"] == 3
+    assert state(tmp_path)["version"] == gen_tokens.STATE_VERSION
+
+
+def test_changed_hash_in_state_rewrites_that_token(tmp_path):
+    build(tmp_path)
+    data = state(tmp_path)
+    data["tokens"]["wolf"]["svg"] = "0" * 64
+    (tmp_path / gen_tokens.STATE_FILE).write_text(json.dumps(data))
+    counts, _ = build(tmp_path)
+    assert (counts["written"], counts["skipped"]) == (1, 2)
+
+
+def test_unregistered_slug_is_deleted(tmp_path, monkeypatch):
+    build(tmp_path, hashed=True)
+    hashed = state(tmp_path)["tokens"]["wolf"]["hashed"]
+    monkeypatch.delitem(gen_tokens.MONSTERS, "wolf")
+    counts, records = build(tmp_path, slugs=["kobold", "ogre"], hashed=True)
+    assert counts["deleted"] == 1
+    assert not (tmp_path / "wolf.svg").exists() and not (tmp_path / hashed).exists()
+    assert "wolf" not in records and "wolf" not in state(tmp_path)["tokens"]
+
+
+def test_dry_run_writes_nothing(tmp_path):
+    counts, _ = build(tmp_path, dry_run=True)
+    assert counts["written"] == 3
+    assert list(tmp_path.iterdir()) == []
+
+
+SCHEMA = gen_tokens.REPO_ROOT / "tools" / "art-generator" / "schemas" / "asset-registry.schema.json"
+TYPES = {"object": dict, "array": list, "string": str}
+
+
+def schema_errors(value, schema, where="$"):
+    """The draft-07 keywords asset-registry.schema.json uses, checked by hand."""
+    if "type" in schema and not isinstance(value, TYPES[schema["type"]]):
+        return [f"{where}: not {schema['type']}"]
+    if "enum" in schema and value not in schema["enum"]:
+        return [f"{where}: {value!r} not in {schema['enum']}"]
+    errors = []
+    if isinstance(value, dict):
+        properties = schema.get("properties", {})
+        errors += [f"{where}: missing {key}" for key in schema.get("required", []) if key not in value]
+        if schema.get("additionalProperties") is False:
+            errors += [f"{where}: unexpected {key}" for key in value if key not in properties]
+        for key, item in value.items():
+            if key in properties:
+                errors += schema_errors(item, properties[key], f"{where}.{key}")
+    if isinstance(value, list) and "items" in schema:
+        for i, item in enumerate(value):
+            errors += schema_errors(item, schema["items"], f"{where}[{i}]")
+    return errors
+
+
+def build_hashed(out):
+    gen_tokens.main(["--out", str(out), "--only", ",".join(SLUGS), "--hashed", "--no-sprite"])
+    return (json.loads((out / gen_tokens.MANIFEST_FILE).read_text()),
+            json.loads((out / gen_tokens.REGISTRY_FILE).read_text()))
+
+
+def test_schema_check_catches_bad_items():
+    schema = json.loads(SCHEMA.read_text())
+    registry = {"registryId": "r", "createdAt": "now",
+                "items": [{"monsterId": "mon-wolf", "approvalStatus": "maybe", "extra": 1}]}
+    assert schema_errors(registry, schema) == [
+        "$.items[0]: missing portraitPath", "$.items[0]: missing tokenPath",
+        "$.items[0]: missing generationStatus", "$.items[0]: unexpected extra",
+        "$.items[0].approvalStatus: 'maybe' not in ['pending', 'approved', 'rejected']"]
+
+
+def test_registry_matches_the_asset_registry_schema(tmp_path, monkeypatch):
+    monkeypatch.setattr(gen_tokens, "REPO_ROOT", tmp_path)
+    out = tmp_path / "public" / "images" / "monsters"
+    manifest, registry = build_hashed(out)
+    assert schema_errors(registry, json.loads(SCHEMA.read_text())) == []
+    assert [item["monsterId"] for item in registry["items"]] == [f"mon-{s}" for s in SLUGS]
+    assert registry["source"] == {"tokenManifest": "public/images/monsters/tokens-manifest.json"}
+    for slug, item in zip(SLUGS, registry["items"]):
+        token = manifest["tokens"][slug]
+        assert token["path"] == f"/images/monsters/{state(out)['tokens'][slug]['hashed']}"
+        assert item["tokenPath"] == "public" + token["path"]
+        assert item["portraitPath"] == f"public/images/monsters/{slug}.svg"
+        assert (item["generationStatus"], item["approvalStatus"]) == ("generated", "pending")
+        assert (tmp_path / item["tokenPath"]).read_bytes() == (out / f"{slug}.svg").read_bytes()
+
+
+def test_review_survives_rebuilds_until_the_token_changes(tmp_path, monkeypatch):
+    monkeypatch.setenv("SOURCE_DATE_EPOCH", "0")
+    _, registry = build_hashed(tmp_path)
+    assert registry["createdAt"] == "1970-01-01T00:00:00.000Z"
+    for item in registry["items"]:
+        item.update(approvalStatus="approved", notes="ok")
+    (tmp_path / gen_tokens.REGISTRY_FILE).write_text(json.dumps(registry))
+    _, rebuilt = build_hashed(tmp_path)
+    assert rebuilt["items"] == registry["items"]
+    # As if wolf was reviewed when its art hashed differently.
+    registry["items"][SLUGS.index("wolf")]["tokenPath"] = "wolf.00000000.svg"
+    (tmp_path / gen_tokens.REGISTRY_FILE).write_text(json.dumps(registry))
+    _, rebuilt = build_hashed(tmp_path)
+    statuses = {item["monsterId"]: item["approvalStatus"] for item in rebuilt["items"]}
+    assert statuses == {"mon-kobold": "approved", "mon-ogre": "approved", "mon-wolf": "pending"}
+
+
+def test_manifest_is_removed_with_the_last_hashed_token(tmp_path, monkeypatch):
+    build_hashed(tmp_path)
+    for slug in SLUGS:
+        monkeypatch.delitem(gen_tokens.MONSTERS, slug)
+    gen_tokens.main(["--out", str(tmp_path), "--only", "ape", "--no-sprite"])
+    assert not (tmp_path / gen_tokens.MANIFEST_FILE).exists()
+    assert not (tmp_path / gen_tokens.REGISTRY_FILE).exists()
+
+
+@pytest.mark.parametrize("sizes", ["0", "-64,128", ","])
+def test_non_positive_sizes_are_rejected(sizes, capsys):
+    with pytest.raises(SystemExit):
+        gen_tokens.parse_args([f"--sizes={sizes}"])
+    assert "--sizes must be positive" in capsys.readouterr().err
+
+
+def test_metrics_follow_dry_run_and_bundle(tmp_path):
+    report = tmp_path / "reports" / "metrics.json"
+    argv = ["--out", str(tmp_path / "out"), "--only", "wolf", "--metrics", str(report)]
+    gen_tokens.main([*argv, "--dry-run"])
+    assert not report.exists()
+    bundle = tmp_path / "tokens.zip"
+    gen_tokens.main([*argv, "--bundle", str(bundle)])
+    assert not report.exists()
+    with zipfile.ZipFile(bundle) as archive:
+        assert [t["slug"] for t in json.loads(archive.read("metrics.json"))["tokens"]] == ["wolf"]
+    gen_tokens.main(argv)
+    assert [t["slug"] for t in json.loads(report.read_text())["tokens"]] == ["wolf"]
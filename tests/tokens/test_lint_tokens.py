@@ -0,0 +1,88 @@
+import json
+
+import lint_tokens
+
+BROKEN = '''from scene import circle, ellipse
+
+
+def build():
+    return [
+        circle(1, 2, 3)
+        (ellipse(1, 2, 3, 4)),
+        -circle(4, 5, 6),
+        circle(1, 2, 3) + ellipse(1, 2, 3, 4),
+        circle(7, 8, "#a" "#b"),
+    ]
+'''
+FIXED = '''from scene import circle, ellipse
+
+
+def build():
+    return [
+        circle(1, 2, 3),
+        (ellipse(1, 2, 3, 4)),
+        circle(4, 5, 6),
+        circle(1, 2, 3), ellipse(1, 2, 3, 4),
+        circle(7, 8, "#a" "#b"),
+    ]
+'''
+
+
+def codes(issues):
+    return [i.code for i in issues]
+
+
+def test_fix_round_trip(tmp_path):
+    path = tmp_path / "tokens.py"
+    path.write_text(BROKEN)
+    assert codes(lint_tokens.lint_file(path, {})) == [
+        "missing-comma", "unary-op", "plus-join", "implicit-concat"]
+    remaining = lint_tokens.lint_file(path, {}, fix=True)
+    assert path.read_text() == FIXED
+    # Only the report-only rule is left, and fixing again changes nothing.
+    assert codes(remaining) == ["implicit-concat"]
+    assert codes(lint_tokens.lint_file(path, {}, fix=True)) == ["implicit-concat"]
+    assert path.read_text() == FIXED
+
+
+def test_cached_issues_keep_their_fixes(tmp_path):
+    path = tmp_path / "tokens.py"
+    path.write_text(BROKEN)
+    cache = {}
+    first = lint_tokens.lint_file(path, cache)
+    assert lint_tokens.lint_file(path, cache) == first
+    lint_tokens.lint_file(path, cache, fix=True)
+    assert path.read_text() == FIXED
+
+
+def test_definition_rules(tmp_path):
+    path = tmp_path / "wolf.json"
+    path.write_text(json.dumps({
+        "monsterId": "wolf",
+        "background": ["#12345", "#222"],
+        "layers": [
+            "# head",
+            "stray",
+            ["elipse", 1, 2, 3, 4],
+            ["circle", 1, 2, {"fill": "#111"}],
+            ["eyes", 80, 120, 95, {"iris": "#ggg"}],
+            ["el", "g", ["rect", 1, 2, 3, 4, {"fill": "whte"}]],
+            ["ellipse", 1, 2, 3, 4, {"fill": "white", "stroke": "url(#grad)"}],
+        ],
+    }, indent=2))
+    assert sorted(codes(lint_tokens.lint_file(path, {}))) == [
+        "bad-arity", "bad-color", "bad-color", "bad-color", "bad-id", "bad-layer",
+        "unknown-helper"]
+
+
+def test_definition_id_fix(tmp_path):
+    path = tmp_path / "wolf.json"
+    path.write_text('{\n  "monsterId": "wolf",\n  "background": ["#111", "#222"],\n  "layers": []\n}\n')
+    assert lint_tokens.lint_file(path, {}, fix=True) == []
+    assert json.loads(path.read_text())["monsterId"] == "mon-wolf"
+
+
+def test_shipped_definitions_are_clean():
+    cache = {}
+    for path in lint_tokens.DEFAULT_FILES:
+        assert lint_tokens.lint_file(path, cache) == [], path.name
@@ -0,0 +1,65 @@
+import json
+
+import gen_tokens, lod, scene
+from scene import circle, el
+
+SLUGS = ["kobold", "ogre", "wolf"]
+
+
+def generate(out, *args):
+    gen_tokens.main(["--out", str(out), "--only", ",".join(SLUGS), "--no-sprite", *args])
+
+
+def pick(manifest, slug, size):
+    """The level the app draws at size CSS px: the first whose maxSize covers it."""
+    level = next(lvl["lod"] for lvl in manifest["levels"]
+                 if lvl["maxSize"] is None or size <= lvl["maxSize"])
+    return manifest["tokens"][slug][level]
+
+
+def nodes(path):
+    return sum(1 for _ in scene.parse(path.read_text()).iter())
+
+
+def level_files(out):
+    return sorted(p.relative_to(out).as_posix() for p in (out / gen_tokens.LOD_DIR).rglob("*.svg"))
+
+
+def test_prune_drops_only_shapes_below_the_threshold():
+    root = el("svg", circle(100, 100, 90), circle(50, 50, 0.5), viewBox="0 0 200 200")
+    assert lod.prune(root.copy(), 256) == 0
+    assert lod.prune(root, 32) == 1
+    assert [c.get("r") for c in root] == [90]
+
+
+def test_manifest_levels_and_selection(tmp_path):
+    generate(tmp_path, "--lod")
+    manifest = json.loads((tmp_path / gen_tokens.LOD_MANIFEST).read_text())
+    sizes = [lvl["maxSize"] for lvl in manifest["levels"]]
+    assert sizes == sorted(size for _, size in lod.LEVELS) + [None]
+    assert sorted(manifest["tokens"]) == SLUGS
+    for slug in SLUGS:
+        full = tmp_path / f"{slug}.svg"
+        assert pick(manifest, slug, 512) == f"{slug}.svg"
+        assert pick(manifest, slug, 48) == manifest["tokens"][slug]["medium"]
+        assert pick(manifest, slug, 24) == manifest["tokens"][slug]["minimal"]
+        medium = tmp_path / pick(manifest, slug, 48)
+        minimal = tmp_path / pick(manifest, slug, 24)
+        assert nodes(minimal) <= nodes(medium) <= nodes(full)
+    # Every listed level exists, and a level that dropped nothing shares a file.
+    listed = {path for token in manifest["tokens"].values() for path in token.values()}
+    assert all((tmp_path / path).exists() for path in listed)
+    assert {p for p in listed if p.startswith(gen_tokens.LOD_DIR)} == set(level_files(tmp_path))
+
+
+def test_levels_are_kept_until_turned_off(tmp_path):
+    generate(tmp_path, "--lod")
+    files = level_files(tmp_path)
+    assert files
+    generate(tmp_path)
+    gen_tokens.main(["--out", str(tmp_path), "--only", "wolf", "--no-sprite"])
+    assert level_files(tmp_path) == files
+    assert (tmp_path / gen_tokens.LOD_MANIFEST).exists()
+    gen_tokens.main(["--out", str(tmp_path), "--only", "wolf", "--no-sprite", "--no-lod"])
+    assert level_files(tmp_path) == []
+    assert not (tmp_path / gen_tokens.LOD_MANIFEST).exists()
@@ -0,0 +1,70 @@
+import os
+
+import pytest
+
+import output
+
+
+def temp_files(root):
+    return sorted(p.name for p in root.rglob(".*.tmp"))
+
+
+def test_directory_writer_replaces_atomically(tmp_path):
+    (tmp_path / "wolf.svg").write_bytes(b"old")
+    with output.DirectoryWriter(tmp_path, durable=False) as writer:
+        assert writer.write("wolf.svg", b"new")
+        # Staged beside the target; readers still see the old file.
+        assert (tmp_path / "wolf.svg").read_bytes() == b"old"
+        assert temp_files(tmp_path) == [f".wolf.svg.{os.getpid()}.tmp"]
+    assert (tmp_path / "wolf.svg").read_bytes() == b"new"
+    assert temp_files(tmp_path) == []
+
+
+def test_directory_writer_skips_unchanged_bytes(tmp_path):
+    (tmp_path / "wolf.svg").write_bytes(b"same")
+    before = (tmp_path / "wolf.svg").stat().st_mtime_ns
+    with output.DirectoryWriter(tmp_path, durable=False) as writer:
+        assert not writer.write("wolf.svg", b"same")
+        assert writer.write("ogre.svg", b"added")
+    assert writer.written == 1
+    assert (tmp_path / "wolf.svg").stat().st_mtime_ns == before
+    assert (tmp_path / "ogre.svg").read_bytes() == b"added"
+
+
+def test_directory_writer_flushes_in_batches(tmp_path):
+    with output.DirectoryWriter(tmp_path, durable=False, batch=2) as writer:
+        for i in range(3):
+            writer.write(f"{i}.svg", b"x")
+        assert sorted(p.name for p in tmp_path.glob("*.svg")) == ["0.svg", "1.svg"]
+        assert writer.read("2.svg") == b"x"
+    assert temp_files(tmp_path) == []
+
+
+def test_directory_writer_delete_removes_empty_directories(tmp_path):
+    with output.DirectoryWriter(tmp_path, durable=False) as writer:
+        writer.write("lod/medium/wolf.svg", b"x")
+        writer.write("lod/minimal/wolf.svg", b"x")
+    with output.DirectoryWriter(tmp_path, durable=False) as writer:
+        assert writer.delete("lod/medium/wolf.svg")
+        assert not writer.delete("lod/medium/wolf.svg")
+    assert not (tmp_path / "lod" / "medium").exists()
+    assert (tmp_path / "lod" / "minimal" / "wolf.svg").exists()
+
+
+@pytest.mark.parametrize("name", ["tokens.zip", "tokens.tar", "tokens.tar.gz"])
+def test_bundle_writer_is_byte_identical(tmp_path, name):
+    members = {"wolf.svg": b"<svg/>", "lod/medium/wolf.svg": b"<svg></svg>", "sprite.json": b"{}"}
+    bundles = []
+    for run, order in enumerate([list(members), sorted(members, reverse=True)]):
+        path = tmp_path / str(run) / name
+        with output.BundleWriter(path, tmp_path) as writer:
+            for member in order:
+                writer.write(member, members[member])
+        bundles.append(path.read_bytes())
+    assert bundles[0] == bundles[1]
+
+
+def test_bundle_writer_without_members_writes_nothing(tmp_path):
+    with output.BundleWriter(tmp_path / "tokens.zip", tmp_path):
+        pass
+    assert not (tmp_path / "tokens.zip").exists()
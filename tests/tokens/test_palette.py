@@ -0,0 +1,70 @@
+import io
+
+import numpy as np
+import pytest
+
+import gen_tokens, palette, svgopt
+from scene import circle, el, serialize
+
+SIZE = 128
+
+Image = pytest.importorskip("PIL.Image")
+
+
+@pytest.fixture(scope="module")
+def rasterize():
+    try:
+        return gen_tokens.rasterizer()
+    except RuntimeError as err:
+        pytest.skip(str(err))
+
+
+def pixels(data):
+    return np.asarray(Image.open(io.BytesIO(data)).convert("RGBA")).astype(np.int16)
+
+
+def test_seed_colors_are_the_opaque_paints():
+    root = el("svg", circle(1, 1, 1, fill="#f00"), circle(2, 2, 1, fill="#0f0", opacity=0.5),
+              circle(3, 3, 1, fill="#00f", stroke="#ff0", stroke_opacity=0.5), viewBox="0 0 10 10")
+    assert palette.seed_colors(root) == [(255, 0, 0, 255), (0, 0, 255, 255)]
+
+
+def test_few_colours_are_stored_exactly():
+    rgba = np.zeros((4, 4, 4), dtype=np.uint8)
+    rgba[:2] = (200, 10, 10, 255)
+    rgba[3, 3] = (0, 0, 0, 128)
+    indices, colors = palette.quantize(rgba)
+    assert len(colors) == 3
+    assert (colors[indices] == rgba).all()
+
+
+def test_palette_has_ramps_between_meeting_colours():
+    rgba = np.zeros((16, 16, 4), dtype=np.uint8)
+    rgba[:, :8] = (255, 255, 255, 255)
+    rgba[:, 8:] = (0, 0, 0, 255)
+    rgba[:, 7] = (128, 128, 128, 255)
+    entries = palette.build(rgba)
+    assert len(entries) <= palette.LIMIT
+    steps = np.linalg.norm(np.diff(entries[2:], axis=0), axis=1)
+    assert (steps <= palette.RAMP_STEP + 1e-3).all()
+
+
+def test_indexed_rasters_match_the_truecolour_render(rasterize):
+    for slug, build in gen_tokens.MONSTERS.items():
+        root = build()
+        svgopt.inline_fragments(root)
+        svgopt.optimize(root)
+        png = rasterize(serialize(root).encode(), SIZE)
+        before = pixels(png)
+        exact = len(np.unique(before.reshape(-1, 4), axis=0)) <= palette.LIMIT
+        files = palette.encode(png, ["png", "webp"], palette.seed_colors(root))
+        assert Image.open(io.BytesIO(files["png"])).mode == "P", slug
+        for fmt, data in files.items():
+            error = np.abs(pixels(data) - before).max(axis=-1)
+            if exact:
+                assert error.max() == 0, (slug, fmt)
+            # Every pixel lands within a ramp step of its colour and nearly
+            # all within half of one; a full palette leaves a few edges out.
+            assert error.max() <= palette.RAMP_STEP, (slug, fmt)
+            assert (error > palette.RAMP_STEP / 2).mean() < 0.02, (slug, fmt)
+            assert error.mean() < 1, (slug, fmt)
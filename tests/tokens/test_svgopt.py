@@ -0,0 +1,105 @@
+import io
+
+import numpy as np
+import pytest
+
+import gen_tokens, svgopt
+from scene import el, rect, serialize, use
+
+SIZE = 128
+# resvg composites a lone shape's group opacity a few levels off from the
+# same colour baked into the fill, so edge pixels may drift slightly.
+TOLERANCE, STRAY = 8, 0.005
+
+
+def svg(*children):
+    return el("svg", *children, xmlns="http://www.w3.org/2000/svg", viewBox="0 0 100 100")
+
+
+def tags(root):
+    return [child.tag for child in root]
+
+
+def test_merge_keeps_shapes_that_would_jump_an_overlap():
+    # The second red rect sits on the blue one; moving it back under the
+    # blue to join the first would repaint the overlap blue.
+    root = svg(rect(0, 0, 10, 10, fill="#f00"), rect(20, 0, 30, 30, fill="#00f"),
+               rect(25, 5, 10, 10, fill="#f00"))
+    assert svgopt.merge_paths(root) == 0
+    assert tags(root) == ["rect", "rect", "rect"]
+
+
+def test_merge_joins_disjoint_shapes():
+    root = svg(*(rect(20 * i, 0, 10, 10, fill="#f00") for i in range(4)),
+               rect(0, 50, 30, 30, fill="#00f"))
+    assert svgopt.merge_paths(root) == 3
+    assert tags(root) == ["path", "rect"]
+    assert root[0].get("fill") == "#f00"
+
+
+def test_merge_never_adds_bytes():
+    for slug, build in gen_tokens.MONSTERS.items():
+        root = build()
+        svgopt.inline_fragments(root)
+        svgopt.optimize(root, merge=False)
+        before = len(serialize(root))
+        svgopt.merge_paths(root)
+        assert len(serialize(root)) <= before, slug
+
+
+@pytest.mark.parametrize("encoding", ["gz", "br"])
+def test_optimize_never_serves_larger(encoding):
+    for slug, build in gen_tokens.MONSTERS.items():
+        root = build()
+        svgopt.inline_fragments(root)
+        raw = serialize(root).encode()
+        size = svgopt.served_size(serialize(svgopt.optimize(root, flatten=False)).encode(), encoding)
+        if size is None:
+            pytest.skip("brotli is not installed")
+        assert size <= svgopt.served_size(raw, encoding), slug
+
+
+@pytest.fixture(scope="module")
+def render():
+    try:
+        rasterize = gen_tokens.rasterizer()
+    except RuntimeError as err:
+        pytest.skip(str(err))
+    from PIL import Image
+
+    def pixels(root):
+        png = rasterize(serialize(root).encode(), SIZE)
+        return np.asarray(Image.open(io.BytesIO(png)).convert("RGBA")).astype(np.int16)
+    return pixels
+
+
+def assert_same_render(a, b, label):
+    off = (np.abs(a - b).max(axis=-1) > TOLERANCE).mean()
+    assert off < STRAY, f"{label}: {off:.2%} of pixels differ"
+
+
+def test_optimize_renders_like_the_source(render):
+    for slug, build in gen_tokens.MONSTERS.items():
+        root = build()
+        svgopt.inline_fragments(root)
+        before = render(root)
+        assert_same_render(before, render(svgopt.optimize(root)), slug)
+
+
+def test_flatten_renders_like_the_source(render):
+    for slug, build in gen_tokens.MONSTERS.items():
+        root = build()
+        svgopt.inline_fragments(root)
+        before = render(root)
+        svgopt.flatten_opacity(root)
+        assert_same_render(before, render(root), slug)
+
+
+def test_inline_fragments_renders_like_use(render):
+    fragment = el("g", rect(0, 0, 10, 10), rect(12, 0, 10, 10, fill="currentColor"), id="_pair")
+    root = svg(el("defs", fragment), use("_pair", 10, 20, fill="#0a0", color="#a00"),
+               use("_pair", 50, 60, fill="#00a", color="#aa0"))
+    before = render(root)
+    svgopt.inline_fragments(root)
+    assert not list(root.iter("use")) and not list(root.iter("defs"))
+    assert_same_render(before, render(root), "inlined")